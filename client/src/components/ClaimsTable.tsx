@@ -171,7 +171,7 @@ export default function ClaimsTable({ claims, onViewClaim, onExportData }: Claim
                       </div>
                     </TableCell>
                     <TableCell className="text-right">
-                      {parseFloat((claim.area || 0).toString()).toFixed(2)}
+                      {(claim.area || 0).toFixed(2)}
                     </TableCell>
                     <TableCell>
                       <Badge 
@@ -5,7 +5,6 @@ import * as XLSX from 'xlsx';
 import { DatabaseStorage } from './storage';
 import { db } from './db-local';
 import { states, districts } from '@shared/schema-sqlite';
-import { eq } from 'drizzle-orm';
 import type { InsertClaim } from '@shared/schema-sqlite';
 
 export class DataImportService {
@@ -200,6 +199,7 @@ export class DataImportService {
       
       // Import districts (major forest districts across India)
       await this.importDistrictsData(realDistrictsData);
+      this.storage.invalidateReferenceCache();
       
       console.log(`Imported ${realStatesData.length} states and ${realDistrictsData.length} districts from government sources`);
     } catch (error) {
@@ -209,26 +209,20 @@ export class DataImportService {
   }
 
   private async importStatesData(statesData: any[]): Promise<void> {
-    for (const state of statesData) {
-      try {
-        // Check if state already exists to avoid duplicates
-        const existingState = await db.select().from(states).where(eq(states.code, state.code)).limit(1);
-        if (existingState.length === 0) {
-          await db.insert(states).values(state);
-        }
-      } catch (error) {
-        console.warn(`Failed to import state ${state.name}:`, error);
-      }
+    try {
+      // Single multi-row insert; rows that already exist (same id, name or code) are skipped
+      await db.insert(states).values(statesData).onConflictDoNothing();
+    } catch (error) {
+      console.warn('Failed to import states:', error);
     }
   }
 
   private async importDistrictsData(districtsData: any[]): Promise<void> {
-    for (const district of districtsData) {
-      try {
-        await db.insert(districts).values(district);
-      } catch (error) {
-        console.warn(`Failed to import district ${district.name}:`, error);
-      }
+    try {
+      // Single multi-row insert; districts that already exist are skipped
+      await db.insert(districts).values(districtsData).onConflictDoNothing();
+    } catch (error) {
+      console.warn('Failed to import districts:', error);
     }
   }
 
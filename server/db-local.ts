@@ -11,6 +11,14 @@ export const sqlite = new Database(dbPath);
 
 // Enable WAL mode for better concurrent access
 sqlite.pragma('journal_mode = WAL');
+// WAL makes NORMAL sync crash-safe; commits no longer fsync the main database file
+sqlite.pragma('synchronous = NORMAL');
+sqlite.pragma('temp_store = MEMORY');
+sqlite.pragma('mmap_size = 268435456'); // 256MB memory-mapped reads
+sqlite.pragma('cache_size = -64000'); // ~64MB page cache
+// The one connection is shared by every request; wait briefly for a lock held by another
+// process (seed/import scripts) instead of failing with SQLITE_BUSY
+sqlite.pragma('busy_timeout = 5000');
 
 // Create Drizzle instance with SQLite
 export const db = drizzle(sqlite, { schema });
@@ -27,11 +35,32 @@ export async function healthCheck(): Promise<boolean> {
   }
 }
 
+// Synchronous callbacks run right before the connection is closed, so modules that buffer
+// writes (e.g. the audit log queue) can flush them while the database is still open
+const beforeCloseHooks: Array<() => void> = [];
+
+export function onBeforeClose(hook: () => void): void {
+  beforeCloseHooks.push(hook);
+}
+
 // Graceful shutdown handler
 export async function gracefulShutdown(): Promise<void> {
+  if (!sqlite.open) return;
   console.log('Shutting down SQLite database connection...');
+  for (const hook of beforeCloseHooks) {
+    try {
+      hook();
+    } catch (error) {
+      console.error('Error flushing pending writes before shutdown:', error);
+    }
+  }
+  // Refresh query planner statistics gathered over this connection's lifetime
+  sqlite.pragma('optimize');
   sqlite.close();
   console.log('SQLite database shutdown complete');
+  // The handlers below replace Node's default exit on SIGTERM/SIGINT; without a database
+  // connection the server can't do anything useful, so stop here instead of accepting requests
+  process.exit(0);
 }
 
 // Setup process signal handlers
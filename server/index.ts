@@ -33,6 +33,17 @@ app.use(express.json());
 app.use(express.urlencoded({ extended: false }));
 app.use(cookieParser()); // Enable cookie parsing for secure sessions
 
+// Build the short log preview of a JSON body without re-serializing large lists
+// (the line is truncated to 80 characters anyway)
+function summarizeJson(body: unknown): string {
+  if (Array.isArray(body)) {
+    return `[${body.length} items]`;
+  }
+  return JSON.stringify(body, (key, value) =>
+    key !== "" && Array.isArray(value) ? `[${value.length} items]` : value
+  );
+}
+
 app.use((req, res, next) => {
   const start = Date.now();
   const path = req.path;
@@ -49,7 +60,7 @@ app.use((req, res, next) => {
     if (path.startsWith("/api")) {
       let logLine = `${req.method} ${path} ${res.statusCode} in ${duration}ms`;
       if (capturedJsonResponse) {
-        logLine += ` :: ${JSON.stringify(capturedJsonResponse)}`;
+        logLine += ` :: ${summarizeJson(capturedJsonResponse)}`;
       }
 
       if (logLine.length > 80) {
@@ -109,6 +120,13 @@ app.use((req, res, next) => {
   // this serves both the API and the client.
   // It is the only port that is not firewalled.
   const port = parseInt(process.env.PORT || '3000', 10);
+
+  // Keep idle client connections open longer than Node's 5s default, so browsers and a fronting
+  // proxy reuse them instead of reconnecting (and occasionally racing a server-side close).
+  // headersTimeout must stay above keepAliveTimeout.
+  server.keepAliveTimeout = 65 * 1000;
+  server.headersTimeout = 66 * 1000;
+
   server.listen({
     port,
     host: "127.0.0.1",
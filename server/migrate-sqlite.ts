@@ -14,12 +14,47 @@ import {
   fraStatistics
 } from "../shared/schema-sqlite";
 import bcrypt from "bcrypt";
-import { sql } from 'drizzle-orm';
+import { sql, eq, and, isNull, isNotNull } from 'drizzle-orm';
+import fs from 'fs';
+import path from 'path';
 
 const SALT_ROUNDS = 12;
+// Demo accounts have published passwords, so a high cost only slows down first boot
+const SEED_SALT_ROUNDS = 4;
 
-async function hashPassword(password: string): Promise<string> {
-  return bcrypt.hash(password, SALT_ROUNDS);
+async function hashPassword(password: string, rounds: number = SALT_ROUNDS): Promise<string> {
+  return bcrypt.hash(password, rounds);
+}
+
+// Documents uploaded before disk storage kept their bytes in the file_content BLOB. Write each one
+// out to the uploads directory and clear the column, one row at a time so only a single file is
+// held in memory, then VACUUM to give the freed pages back.
+function moveLegacyDocumentContentToDisk() {
+  const legacyDocuments = db
+    .select({ id: documents.id })
+    .from(documents)
+    .where(and(isNotNull(documents.fileContent), isNull(documents.uploadPath)))
+    .all();
+  if (legacyDocuments.length === 0) return;
+
+  const uploadDir = path.join('uploads', 'documents');
+  fs.mkdirSync(uploadDir, { recursive: true });
+
+  for (const { id } of legacyDocuments) {
+    const row = db
+      .select({ filename: documents.filename, fileContent: documents.fileContent })
+      .from(documents)
+      .where(eq(documents.id, id))
+      .get();
+    if (!row?.fileContent) continue;
+
+    const uploadPath = path.join(uploadDir, `${id}_${row.filename.replace(/[^\w.\-]/g, '_')}`);
+    fs.writeFileSync(uploadPath, row.fileContent as Buffer);
+    db.update(documents).set({ uploadPath, fileContent: null }).where(eq(documents.id, id)).run();
+  }
+
+  db.run(sql`VACUUM`);
+  console.log(`Moved ${legacyDocuments.length} legacy document files from SQLite to disk`);
 }
 
 export async function migrateSQLite() {
@@ -202,8 +237,30 @@ export async function migrateSQLite() {
     )
   `);
 
+  // Indexes for the hot filter predicates (idempotent, also upgrades existing databases)
+  db.run(sql`CREATE INDEX IF NOT EXISTS ix_user_sessions_expires_at ON user_sessions (expires_at)`);
+  db.run(sql`CREATE INDEX IF NOT EXISTS ix_claims_status ON claims (status)`);
+  db.run(sql`CREATE INDEX IF NOT EXISTS ix_claims_date_submitted ON claims (date_submitted)`);
+  db.run(sql`CREATE INDEX IF NOT EXISTS ix_claims_updated_at ON claims (updated_at)`);
+  db.run(sql`CREATE INDEX IF NOT EXISTS ix_claims_state_status ON claims (state, status)`);
+  db.run(sql`CREATE INDEX IF NOT EXISTS ix_claims_district_status ON claims (district, status)`);
+  db.run(sql`CREATE INDEX IF NOT EXISTS ix_claims_state_date ON claims (state, date_submitted DESC)`);
+  db.run(sql`CREATE INDEX IF NOT EXISTS ix_claims_assigned_officer_date ON claims (assigned_officer, date_submitted DESC)`);
+  // (ocr_status, review_status) also serves ocr_status-only lookups, so it replaces ix_documents_ocr_status
+  db.run(sql`DROP INDEX IF EXISTS ix_documents_ocr_status`);
+  db.run(sql`CREATE INDEX IF NOT EXISTS ix_documents_ocr_review ON documents (ocr_status, review_status)`);
+  db.run(sql`CREATE INDEX IF NOT EXISTS ix_documents_claim_review ON documents (claim_id, review_status)`);
+  // Documents list pages order on coalesce(created_at, -1); index that expression instead
+  db.run(sql`DROP INDEX IF EXISTS ix_documents_created_at`);
+  db.run(sql`CREATE INDEX IF NOT EXISTS ix_documents_created_at_key ON documents (coalesce(created_at, -1))`);
+  db.run(sql`CREATE INDEX IF NOT EXISTS ix_audit_log_user_id ON audit_log (user_id)`);
+  db.run(sql`CREATE INDEX IF NOT EXISTS ix_audit_log_resource_id ON audit_log (resource_id)`);
+  db.run(sql`CREATE INDEX IF NOT EXISTS ix_audit_log_resource_created ON audit_log (resource_type, resource_id, created_at DESC)`);
+
   console.log('SQLite tables created successfully');
 
+  moveLegacyDocumentContentToDisk();
+
   // Check if data already exists
   const existingStates = db.select().from(states).limit(1).all();
   if (existingStates.length > 0) {
@@ -222,8 +279,6 @@ export async function migrateSQLite() {
     { id: 5, name: "Maharashtra", code: "MH", language: "Marathi" },
     { id: 6, name: "Gujarat", code: "GJ", language: "Gujarati" },
   ];
-  
-  db.insert(states).values(statesData).run();
 
   // Seed districts  
   const districtsData = [
@@ -235,7 +290,10 @@ export async function migrateSQLite() {
     { id: 6, name: "Warangal", stateId: 3 },
   ];
 
-  db.insert(districts).values(districtsData).run();
+  // Hash demo passwords concurrently (bcrypt runs on the libuv thread pool)
+  const [adminHash, stateHash, districtHash, villageHash] = await Promise.all(
+    ["admin123", "state123", "district123", "village123"].map(pw => hashPassword(pw, SEED_SALT_ROUNDS))
+  );
 
   // Seed demo users with hashed passwords
   const demoUsersData = [
@@ -243,7 +301,7 @@ export async function migrateSQLite() {
       id: "admin-1", 
       username: "ministry.admin", 
       email: "admin@tribal.gov.in", 
-      password: await hashPassword("admin123"), 
+      password: adminHash, 
       fullName: "Ministry Administrator", 
       role: "ministry",
       stateId: null, 
@@ -254,7 +312,7 @@ export async function migrateSQLite() {
       id: "state-1", 
       username: "mp.admin", 
       email: "mp@tribal.gov.in",
-      password: await hashPassword("state123"), 
+      password: stateHash, 
       fullName: "MP State Administrator", 
       role: "state",
       stateId: 1, 
@@ -265,7 +323,7 @@ export async function migrateSQLite() {
       id: "district-1", 
       username: "district.officer", 
       email: "district@tribal.gov.in",
-      password: await hashPassword("district123"), 
+      password: districtHash, 
       fullName: "District Officer", 
       role: "district",
       stateId: 1, 
@@ -276,7 +334,7 @@ export async function migrateSQLite() {
       id: "village-1", 
       username: "village.officer", 
       email: "village@tribal.gov.in",
-      password: await hashPassword("village123"), 
+      password: villageHash, 
       fullName: "Village Officer", 
       role: "village",
       stateId: 1, 
@@ -285,8 +343,13 @@ export async function migrateSQLite() {
     }
   ];
 
-  db.insert(users).values(demoUsersData).run();
-  
+  // Insert all seed rows in one transaction so the seed commits (and fsyncs) once
+  db.transaction((tx) => {
+    tx.insert(states).values(statesData).run();
+    tx.insert(districts).values(districtsData).run();
+    tx.insert(users).values(demoUsersData).run();
+  });
+
   console.log('SQLite database seeded successfully!');
   console.log('Demo users created:');
   console.log('- ministry.admin / admin123 (Ministry Administrator)');
@@ -0,0 +1,11 @@
+// Confidence stored in documents.confidence (REAL, 0-100) for a finished OCR run.
+// Tesseract's measured score wins; a numeric score from the structured extraction is next, and
+// the heuristic estimate is the fallback. extractStructuredData labels its result with strings
+// such as 'High' or 'Unknown', which never belong in the numeric column.
+export function resolveOCRConfidence(
+  ocrConfidence: number | null,
+  extractedConfidence: unknown,
+  estimate: () => number
+): number {
+  return ocrConfidence ?? (typeof extractedConfidence === 'number' ? extractedConfidence : estimate());
+}
@@ -4,7 +4,7 @@ import { parse } from 'csv-parse/sync';
 import crypto from 'crypto';
 import { DatabaseStorage } from './storage';
 import { db } from './db-local';
-import { fraStatistics, claims } from '@shared/schema-sqlite';
+import { fraStatistics } from '@shared/schema-sqlite';
 import type { InsertFraStatistics, InsertClaim } from '@shared/schema-sqlite';
 
 export interface RealFRARecord {
@@ -186,7 +186,7 @@ export class RealFRAImportService {
 
       console.log(`Found ${records.length} authentic FRA claims to import`);
 
-      let claimsImported = 0;
+      const claimRows: InsertClaim[] = [];
 
       for (const record of records) {
         try {
@@ -228,7 +228,7 @@ export class RealFRAImportService {
             status: status,
             dateSubmitted: this.parseDate(record.Submission_Date || ''),
             dateProcessed: this.parseDate(record.Last_Updated || ''),
-            coordinates: coordinates ? JSON.stringify(coordinates) : null,
+            coordinates, // json-mode column: Drizzle serializes the object itself
             surveyNumber: record.Survey_Number || '',
             forestType: record.Forest_Type || '',
             tribalCommunity: record.Tribal_Community || '',
@@ -237,19 +237,24 @@ export class RealFRAImportService {
             notes: `Imported from authentic government FRA claims dataset`
           };
 
-          // Insert claim into database
-          await db.insert(claims).values(claimData);
-          claimsImported++;
-          
-          if (claimsImported % 10 === 0) {
-            console.log(`Imported ${claimsImported}/${records.length} claims...`);
-          }
+          claimRows.push(claimData);
 
         } catch (error) {
           console.warn(`Failed to import claim ${record.Claim_ID}:`, error);
         }
       }
 
+      // Insert all claims in one transaction using multi-row INSERTs; rows that fail are reported individually
+      const results = await this.storage.createClaims(claimRows);
+      let claimsImported = 0;
+      results.forEach((result, index) => {
+        if (result instanceof Error) {
+          console.warn(`Failed to import claim ${claimRows[index].claimId}:`, result);
+        } else {
+          claimsImported++;
+        }
+      });
+
       console.log(`Successfully imported ${claimsImported} authentic FRA claims from government dataset`);
       return claimsImported;
     } catch (error) {
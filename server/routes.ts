@@ -1,7 +1,7 @@
-import type { Express } from "express";
+import type { Express, Request, Response } from "express";
 import { createServer, type Server } from "http";
 import { WebSocketServer, WebSocket } from "ws";
-import { storage } from "./storage";
+import { storage, type ClaimFilter, type DocumentMetadata, type PageCursor } from "./storage";
 import { DataImportService } from "./data-import";
 import { GovernmentAPIService } from "./govt-api-service";
 import {
@@ -13,15 +13,19 @@ import {
   insertWorkflowTransitionSchema
 } from "@shared/schema-sqlite";
 import { analyzeDocument, classifyDocument, extractText, summarizeDocument } from "./gemini-ai-service";
+import { resolveOCRConfidence } from "./ocr-confidence";
 import { z } from 'zod';
 import { randomUUID } from "crypto";
 import multer from "multer";
 import csv from "csv-parser";
-import { Readable } from "stream";
-import { createWorker, PSM } from "tesseract.js";
-import type { Document } from "@shared/schema-sqlite";
+import { Transform, compose } from "stream";
+import { pipeline } from "stream/promises";
+import { createWorker, createScheduler, PSM, type Scheduler } from "tesseract.js";
+import { claims as claimsTable, type Claim, type Document } from "@shared/schema-sqlite";
+import { getTableColumns } from "drizzle-orm";
 import fs from "fs";
 import path from "path";
+import os from "os";
 
 // Utility function to sanitize document objects by removing fileContent
 function sanitizeDocument<T extends Document>(document: T): Omit<T, 'fileContent'> {
@@ -29,9 +33,126 @@ function sanitizeDocument<T extends Document>(document: T): Omit<T, 'fileContent
   return sanitizedDoc;
 }
 
-// Utility function to sanitize arrays of documents
-function sanitizeDocuments<T extends Document>(documents: T[]): Omit<T, 'fileContent'>[] {
-  return documents.map(doc => sanitizeDocument(doc));
+// Uploaded document files live on disk; only the path is stored in the database
+const DOCUMENT_UPLOAD_DIR = path.join('uploads', 'documents');
+const MAX_DOCUMENT_SIZE = 50 * 1024 * 1024; // 50MB
+const ALLOWED_DOCUMENT_TYPES = ['application/pdf', 'image/jpeg', 'image/png', 'image/tiff'];
+
+function documentStorageFilename(originalName: string): string {
+  return `${randomUUID()}_${originalName.replace(/[^\w.\-]/g, '_')}`;
+}
+
+// List responses are serialized row by row and written in chunks instead of building one
+// JSON string for the whole array; writes wait for the socket to drain between chunks.
+const JSON_STREAM_CHUNK_ROWS = 500;
+
+function waitForDrain(res: Response): Promise<void> {
+  return new Promise(resolve => {
+    const done = () => {
+      res.off('drain', done);
+      res.off('close', done);
+      resolve();
+    };
+    res.on('drain', done);
+    res.on('close', done);
+  });
+}
+
+async function sendJsonArray(res: Response, rows: Iterable<unknown> | AsyncIterable<unknown>) {
+  res.type('json');
+  let chunk = '[';
+  let count = 0;
+  for await (const row of rows) {
+    chunk += (count === 0 ? '' : ',') + JSON.stringify(row);
+    if (++count % JSON_STREAM_CHUNK_ROWS === 0) {
+      if (!res.write(chunk)) {
+        await waitForDrain(res);
+      }
+      if (res.destroyed) return;
+      chunk = '';
+    }
+  }
+  res.end(chunk + ']');
+}
+
+// Rows per keyset page when streaming claim lists
+const CLAIMS_LIST_BATCH_SIZE = 1000;
+
+// Opt-in pagination for list endpoints: ?limit=N[&before=<cursor>]. Returns the page size to use,
+// or undefined when the client asked for the full list.
+const MAX_PAGE_SIZE = 500;
+
+function parsePageLimit(value: unknown): number | undefined {
+  const limit = parseInt(String(value ?? ''), 10);
+  return limit > 0 ? Math.min(limit, MAX_PAGE_SIZE) : undefined;
+}
+
+// Cursors are "<unix seconds>_<id>" of the last row on the previous page; rows without a
+// timestamp sort last and use -1, matching the storage ordering
+function encodePageCursor(at: Date | null, id: string): string {
+  return `${at ? Math.floor(at.getTime() / 1000) : -1}_${id}`;
+}
+
+function parsePageCursor(value: unknown): PageCursor | undefined {
+  const match = typeof value === 'string' ? /^(-?\d+)_(.+)$/.exec(value) : null;
+  return match ? { at: Number(match[1]), id: match[2] } : undefined;
+}
+
+// A full page may be followed by more rows; hand the client the cursor for the next one
+function sendPage<T extends { id: string }>(res: Response, rows: T[], limit: number, timestampOf: (row: T) => Date | null) {
+  if (rows.length === limit) {
+    const last = rows[rows.length - 1];
+    res.set('X-Next-Cursor', encodePageCursor(timestampOf(last), last.id));
+  }
+  return sendJsonArray(res, rows);
+}
+
+async function* flattenBatches<T>(batches: AsyncIterable<T[]>): AsyncGenerator<T> {
+  for await (const batch of batches) {
+    yield* batch;
+  }
+}
+
+// Claim fields a PATCH may set; computed once so each update is a plain key lookup.
+// id and the timestamps are managed by the server and can never be mass-assigned.
+const CLAIM_UPDATABLE_FIELDS = new Set(
+  Object.keys(getTableColumns(claimsTable)).filter(key => !['id', 'createdAt', 'updatedAt'].includes(key))
+);
+
+// Quote a CSV field per RFC 4180: embedded quotes are doubled, so commas and newlines stay in the field
+function csvField(value: unknown): string {
+  const text = value === null || value === undefined ? '' : String(value);
+  return `"${text.replace(/"/g, '""')}"`;
+}
+
+// Reference data (states, districts) changes at most a few times a year. Serve it with a
+// strong ETag derived from row count + newest row so clients revalidate with a cheap 304.
+const REFERENCE_DATA_CACHE_CONTROL = 'public, max-age=3600';
+
+function sendReferenceData(req: Request, res: Response, rows: { id: number; createdAt: Date | null }[]) {
+  let maxId = 0;
+  let maxCreatedAt = 0;
+  for (const row of rows) {
+    if (row.id > maxId) maxId = row.id;
+    const createdAt = row.createdAt?.getTime() ?? 0;
+    if (createdAt > maxCreatedAt) maxCreatedAt = createdAt;
+  }
+
+  res.set('Cache-Control', REFERENCE_DATA_CACHE_CONTROL);
+  res.set('ETag', `"${rows.length}-${maxId}-${maxCreatedAt}"`);
+  if (req.fresh) {
+    return res.status(304).end();
+  }
+  res.json(rows);
+}
+
+// Read a document's file content from disk, falling back to the legacy BLOB column
+async function readDocumentContent(document: DocumentMetadata): Promise<Buffer | null> {
+  if (document.uploadPath) {
+    return fs.promises.readFile(document.uploadPath);
+  }
+  const legacyDocument = await storage.getDocument(document.id);
+  return (legacyDocument?.fileContent as Buffer | null) ?? null;
 }
 
 // Authentication middleware
@@ -42,13 +163,13 @@ async function requireAuth(req: any, res: any, next: any) {
       return res.status(401).json({ error: "Authentication required" });
     }
 
-    const session = await storage.getSession(token);
-    if (!session) {
+    const result = await storage.getSessionWithUser(token);
+    if (!result) {
       return res.status(401).json({ error: "Invalid or expired session" });
     }
 
-    const user = await storage.getUser(session.userId);
-    if (!user || !user.isActive) {
+    const { session, user } = result;
+    if (!user.isActive) {
       return res.status(401).json({ error: "User not found or inactive" });
     }
 
@@ -85,6 +206,44 @@ export async function registerRoutes(app: Express): Promise<Server> {
     limits: { fileSize: 50 * 1024 * 1024 } // 50MB limit
   });
 
+  // CSV imports are spooled to a temp file and parsed from there, so a large import is never
+  // held in memory as a whole; the route deletes the file when it is done
+  const csvUpload = multer({
+    storage: multer.diskStorage({}),
+    limits: { fileSize: 50 * 1024 * 1024 } // 50MB limit
+  });
+
+  // Documents are streamed straight to disk instead of being buffered in memory
+  fs.mkdirSync(DOCUMENT_UPLOAD_DIR, { recursive: true });
+  const documentUpload = multer({
+    storage: multer.diskStorage({
+      destination: DOCUMENT_UPLOAD_DIR,
+      filename: (_req, file, cb) => cb(null, documentStorageFilename(file.originalname))
+    }),
+    // Reject unsupported types from the part headers, before any bytes are written to disk
+    fileFilter: (req, file, cb) => {
+      if (ALLOWED_DOCUMENT_TYPES.includes(file.mimetype)) {
+        cb(null, true);
+      } else {
+        (req as any).unsupportedFileType = true;
+        cb(null, false);
+      }
+    },
+    limits: { fileSize: MAX_DOCUMENT_SIZE }
+  });
+
+  // Avatars are small but still streamed to disk; the 2MB cap stops oversized uploads mid-stream
+  const AVATAR_UPLOAD_DIR = path.join('uploads', 'avatars');
+  const MAX_AVATAR_SIZE = 2 * 1024 * 1024;
+  fs.mkdirSync(AVATAR_UPLOAD_DIR, { recursive: true });
+  const avatarUpload = multer({
+    storage: multer.diskStorage({
+      destination: AVATAR_UPLOAD_DIR,
+      filename: (req: any, file, cb) => cb(null, `${req.user.id}_${Date.now()}${path.extname(file.originalname)}`)
+    }),
+    limits: { fileSize: MAX_AVATAR_SIZE }
+  }).single('avatar');
+
   // Authentication routes
   app.get("/api/auth/me", requireAuth, async (req: any, res: any) => {
     try {
@@ -133,42 +292,35 @@ export async function registerRoutes(app: Express): Promise<Server> {
   });
 
   // Avatar upload route
-  app.post("/api/user/avatar", requireAuth, upload.single('avatar'), async (req: any, res: any) => {
+  app.post("/api/user/avatar", requireAuth, (req: any, res: any, next: any) => {
+    avatarUpload(req, res, (err: any) => {
+      // Validate file size (2MB max)
+      if (err?.code === 'LIMIT_FILE_SIZE') {
+        return res.status(400).json({ error: "File size must be less than 2MB" });
+      }
+      next(err);
+    });
+  }, async (req: any, res: any) => {
     try {
       if (!req.file) {
         return res.status(400).json({ error: "No file uploaded" });
       }
 
+      // Multer has already written the file to uploads/avatars
+      const filePath = req.file.path;
+
       // Validate file type
       if (!req.file.mimetype.startsWith('image/')) {
+        await fs.promises.unlink(filePath).catch(() => { });
         return res.status(400).json({ error: "File must be an image" });
       }
 
-      // Validate file size (2MB max)
-      if (req.file.size > 2 * 1024 * 1024) {
-        return res.status(400).json({ error: "File size must be less than 2MB" });
-      }
-
-      // Generate unique filename
-      const fileExtension = path.extname(req.file.originalname);
-      const fileName = `${req.user.id}_${Date.now()}${fileExtension}`;
-      const filePath = path.join('uploads', 'avatars', fileName);
-
-      // Ensure uploads/avatars directory exists
-      const uploadsDir = path.join('uploads', 'avatars');
-      if (!fs.existsSync(uploadsDir)) {
-        fs.mkdirSync(uploadsDir, { recursive: true });
-      }
-
-      // Save file to disk
-      fs.writeFileSync(filePath, req.file.buffer);
-
       // Update user record with avatar path
       const updatedUser = await storage.updateUser(req.user.id, { avatar: filePath });
 
       if (!updatedUser) {
         // Clean up file if user update failed
-        fs.unlinkSync(filePath);
+        await fs.promises.unlink(filePath).catch(() => { });
         return res.status(500).json({ error: "Failed to update user record" });
       }
 
@@ -178,6 +330,9 @@ export async function registerRoutes(app: Express): Promise<Server> {
       });
     } catch (error) {
       console.error('Avatar upload error:', error);
+      if (req.file) {
+        await fs.promises.unlink(req.file.path).catch(() => { });
+      }
       res.status(500).json({ error: "Failed to upload avatar" });
     }
   });
@@ -194,7 +349,9 @@ export async function registerRoutes(app: Express): Promise<Server> {
       }
 
       // Check if file exists
-      if (!fs.existsSync(user.avatar)) {
+      try {
+        await fs.promises.access(user.avatar);
+      } catch {
         return res.status(404).json({ error: "Avatar file not found" });
       }
 
@@ -283,27 +440,6 @@ export async function registerRoutes(app: Express): Promise<Server> {
     }
   });
 
-  app.post("/api/auth/logout", async (req, res) => {
-    try {
-      const token = req.cookies.fra_session;
-      if (token) {
-        await storage.deleteSession(token);
-      }
-
-      // Clear the session cookie
-      res.clearCookie('fra_session', {
-        httpOnly: true,
-        secure: process.env.NODE_ENV === 'production',
-        sameSite: 'strict',
-        path: '/'
-      });
-
-      res.json({ message: "Logged out successfully" });
-    } catch (error) {
-      res.status(500).json({ error: "Logout failed" });
-    }
-  });
-
   app.get("/api/auth/profile", async (req, res) => {
     try {
       const token = req.cookies.fra_session;
@@ -311,13 +447,14 @@ export async function registerRoutes(app: Express): Promise<Server> {
         return res.status(401).json({ error: "Authentication required" });
       }
 
-      const session = await storage.getSession(token);
-      if (!session) {
+      // Same cached session+user lookup as requireAuth
+      const result = await storage.getSessionWithUser(token);
+      if (!result) {
         return res.status(401).json({ error: "Invalid or expired session" });
       }
 
-      const user = await storage.getUser(session.userId);
-      if (!user || !user.isActive) {
+      const { user } = result;
+      if (!user.isActive) {
         return res.status(404).json({ error: "User not found or inactive" });
       }
 
@@ -339,27 +476,31 @@ export async function registerRoutes(app: Express): Promise<Server> {
   // Dashboard stats API
   app.get("/api/dashboard/stats", requireAuth, async (req: any, res: any) => {
     try {
-      const allClaims = await storage.getAllClaims();
+      // Counts and area are aggregated in SQL; only one row per status comes back
+      const [claimStats, documentCounts] = await Promise.all([
+        storage.getClaimStatusStats(),
+        storage.getDocumentStatusCounts()
+      ]);
 
-      // Calculate statistics
-      const totalClaims = allClaims.length;
-      const approvedClaims = allClaims.filter(c => c.status === 'approved').length;
-      const pendingClaims = allClaims.filter(c => c.status === 'pending').length;
-      const underReviewClaims = allClaims.filter(c => c.status === 'under-review').length;
-      const rejectedClaims = allClaims.filter(c => c.status === 'rejected').length;
+      const claimsByStatus = new Map(claimStats.map(row => [row.status, row.count]));
+      const totalClaims = claimStats.reduce((sum, row) => sum + row.count, 0);
+      const approvedClaims = claimsByStatus.get('approved') ?? 0;
+      const pendingClaims = claimsByStatus.get('pending') ?? 0;
+      const underReviewClaims = claimsByStatus.get('under-review') ?? 0;
+      const rejectedClaims = claimsByStatus.get('rejected') ?? 0;
 
       // Calculate total area
-      const totalAreaNum = allClaims.reduce((sum, claim) => sum + parseFloat(claim.area.toString()), 0);
+      const totalAreaNum = claimStats.reduce((sum, row) => sum + row.totalArea, 0);
       const totalArea = totalAreaNum > 1000
         ? `${(totalAreaNum / 1000).toFixed(2)}K hectares`
         : `${totalAreaNum.toFixed(2)} hectares`;
 
       // Get real documents count from OCR processing
-      const allDocuments = await storage.getAllDocuments();
-      const totalDocuments = allDocuments.length;
-      const processedDocuments = allDocuments.filter(doc => doc.ocrStatus === 'completed').length;
-      const failedDocuments = allDocuments.filter(doc => doc.ocrStatus === 'failed').length;
-      const processingDocuments = allDocuments.filter(doc => doc.ocrStatus === 'processing').length;
+      const documentsByStatus = new Map(documentCounts.map(row => [row.ocrStatus, row.count]));
+      const totalDocuments = documentCounts.reduce((sum, row) => sum + row.count, 0);
+      const processedDocuments = documentsByStatus.get('completed') ?? 0;
+      const failedDocuments = documentsByStatus.get('failed') ?? 0;
+      const processingDocuments = documentsByStatus.get('processing') ?? 0;
 
       const stats = {
         totalClaims,
@@ -451,105 +592,88 @@ export async function registerRoutes(app: Express): Promise<Server> {
   });
 
   // OCR Analytics API - Returns detailed OCR processing statistics and extracted data insights
+  // toLocaleDateString builds a new formatter on every call; reuse one for month keys
+  const MONTH_KEY_FORMAT = new Intl.DateTimeFormat('en-US', { month: 'short', year: 'numeric' });
+
   app.get("/api/analytics/ocr", requireAuth, async (req: any, res: any) => {
     try {
-      const allDocuments = await storage.getAllDocuments();
+      // Only the columns the statistics read; the OCR text is never loaded
+      const allDocuments = await storage.getDocumentOCRSummaries();
 
-      // Basic OCR statistics
+      // Everything below is gathered in a single pass over the documents, without building
+      // intermediate filtered arrays
       const totalDocuments = allDocuments.length;
-      const completedDocuments = allDocuments.filter(doc => doc.ocrStatus === 'completed');
-      const failedDocuments = allDocuments.filter(doc => doc.ocrStatus === 'failed');
-      const processingDocuments = allDocuments.filter(doc => doc.ocrStatus === 'processing');
-
-      // Processing accuracy and confidence metrics
-      const successRate = totalDocuments > 0 ? (completedDocuments.length / totalDocuments) * 100 : 0;
-      const avgConfidence = completedDocuments.length > 0
-        ? completedDocuments.reduce((sum, doc) => sum + (doc.confidence || 0), 0) / completedDocuments.length
-        : 0;
+      let completedCount = 0;
+      let failedCount = 0;
+      let processingCount = 0;
+      let confidenceSum = 0;
 
-      // Document type distribution from extracted data
       const documentTypes = new Map<string, number>();
-      const extractedClaimsData: any[] = [];
+      const stateDistribution = new Map<string, number>();
+      const landTypeDistribution = new Map<string, number>();
       let totalExtractedArea = 0;
       let extractedClaimsCount = 0;
 
-      completedDocuments.forEach(doc => {
-        if (doc.extractedData && typeof doc.extractedData === 'object') {
-          const data = doc.extractedData as any;
+      // Monthly processing trends (last 6 months)
+      const monthlyProcessing = new Map<string, { processed: number; failed: number }>();
+
+      for (const doc of allDocuments) {
+        if (doc.ocrStatus === 'completed') {
+          completedCount++;
+          confidenceSum += doc.confidence || 0;
+
+          if (doc.extractedData && typeof doc.extractedData === 'object') {
+            const data = doc.extractedData as any;
 
-          // Document type analysis
-          const docType = data.documentType || 'Unknown';
-          documentTypes.set(docType, (documentTypes.get(docType) || 0) + 1);
+            // Document type analysis
+            const docType = data.documentType || 'Unknown';
+            documentTypes.set(docType, (documentTypes.get(docType) || 0) + 1);
 
-          // Extract claims data if available
-          if (data.extractedFields) {
+            // Extracted claims: count, area, state-wise and land type distribution
             const fields = data.extractedFields;
-            if (fields.claimNumber || fields.applicantName) {
+            if (fields && (fields.claimNumber || fields.applicantName)) {
               extractedClaimsCount++;
-
-              // Calculate total area from extracted data
               if (fields.area && typeof fields.area === 'number') {
                 totalExtractedArea += fields.area;
               }
-
-              // Collect structured claims data for analytics
-              extractedClaimsData.push({
-                claimId: fields.claimNumber || 'Unknown',
-                claimantName: fields.applicantName || 'Unknown',
-                state: fields.state || 'Unknown',
-                district: fields.district || 'Unknown',
-                village: fields.village || 'Unknown',
-                area: fields.area || 0,
-                landType: fields.landType || 'Unknown',
-                documentType: docType,
-                confidence: doc.confidence || 0,
-                extractedAt: doc.updatedAt
-              });
+              const state = fields.state || 'Unknown';
+              stateDistribution.set(state, (stateDistribution.get(state) || 0) + 1);
+              const landType = fields.landType || 'Unknown';
+              landTypeDistribution.set(landType, (landTypeDistribution.get(landType) || 0) + 1);
             }
           }
+        } else if (doc.ocrStatus === 'failed') {
+          failedCount++;
+        } else if (doc.ocrStatus === 'processing') {
+          processingCount++;
         }
-      });
-
-      // State-wise extracted claims distribution
-      const stateDistribution = new Map<string, number>();
-      extractedClaimsData.forEach(claim => {
-        stateDistribution.set(claim.state, (stateDistribution.get(claim.state) || 0) + 1);
-      });
-
-      // Land type distribution
-      const landTypeDistribution = new Map<string, number>();
-      extractedClaimsData.forEach(claim => {
-        landTypeDistribution.set(claim.landType, (landTypeDistribution.get(claim.landType) || 0) + 1);
-      });
 
-      // Monthly processing trends (last 6 months)
-      const monthlyProcessing = new Map<string, { processed: number; failed: number }>();
-      const now = new Date();
-
-      allDocuments.forEach(doc => {
         const dateValue = doc.updatedAt || doc.createdAt;
-        if (!dateValue) return;
-        const docDate = new Date(dateValue);
-        const monthKey = docDate.toLocaleDateString('en-US', { month: 'short', year: 'numeric' });
+        if (!dateValue) continue;
+        const monthKey = MONTH_KEY_FORMAT.format(new Date(dateValue));
 
-        if (!monthlyProcessing.has(monthKey)) {
-          monthlyProcessing.set(monthKey, { processed: 0, failed: 0 });
+        let monthData = monthlyProcessing.get(monthKey);
+        if (!monthData) {
+          monthData = { processed: 0, failed: 0 };
+          monthlyProcessing.set(monthKey, monthData);
         }
-
-        const monthData = monthlyProcessing.get(monthKey)!;
         if (doc.ocrStatus === 'completed') {
           monthData.processed++;
         } else if (doc.ocrStatus === 'failed') {
           monthData.failed++;
         }
-      });
+      }
+
+      // Processing accuracy and confidence metrics
+      const successRate = totalDocuments > 0 ? (completedCount / totalDocuments) * 100 : 0;
+      const avgConfidence = completedCount > 0 ? confidenceSum / completedCount : 0;
 
       const response = {
         summary: {
           totalDocuments,
-          processedDocuments: completedDocuments.length,
-          failedDocuments: failedDocuments.length,
-          processingDocuments: processingDocuments.length,
+          processedDocuments: completedCount,
+          failedDocuments: failedCount,
+          processingDocuments: processingCount,
           successRate: Math.round(successRate * 100) / 100,
           averageConfidence: Math.round(avgConfidence * 100) / 100,
           extractedClaimsCount,
@@ -558,7 +682,7 @@ export async function registerRoutes(app: Express): Promise<Server> {
         documentTypes: Array.from(documentTypes.entries()).map(([type, count]) => ({
           type,
           count,
-          percentage: Math.round((count / completedDocuments.length) * 100)
+          percentage: Math.round((count / completedCount) * 100)
         })),
         stateDistribution: Array.from(stateDistribution.entries()).map(([state, count]) => ({
           state,
@@ -583,6 +707,10 @@ export async function registerRoutes(app: Express): Promise<Server> {
     }
   });
 
+  // Aggregates memoized per filter combination, invalidated by the claims table version
+  const CLAIMS_AGGREGATE_CACHE_MAX_ENTRIES = 200;
+  const claimsAggregateCache = new Map<string, { version: string; data: any[] }>();
+
   // UNIFIED Claims API - Returns aggregated statistics by state/district/year/month
   app.get("/api/claims", requireAuth, async (req, res) => {
     try {
@@ -594,24 +722,42 @@ export async function registerRoutes(app: Express): Promise<Server> {
 
       // If format=detailed, return individual claims (legacy support with all filters)
       if (format === 'detailed') {
-        let claims = await storage.getAllClaims();
-
-        // Apply all legacy filters
-        if (state) {
-          claims = await storage.getClaimsByState(state as string);
-        } else if (district) {
-          claims = await storage.getClaimsByDistrict(district as string);
-        } else if (status) {
-          claims = await storage.getClaimsByStatus(status as string);
-        } else if (officer) {
-          claims = await storage.getClaimsByOfficer(officer as string);
+        // Apply the first legacy filter given, and page through the claims in keyset batches
+        // so the response is serialized as rows arrive instead of after loading the whole table
+        const filter: ClaimFilter = state
+          ? { state: state as string }
+          : district
+            ? { district: district as string }
+            : status
+              ? { status: status as string }
+              : officer
+                ? { assignedOfficer: officer as string }
+                : {};
+
+        const limit = parsePageLimit(req.query.limit);
+        if (limit) {
+          const before = parsePageCursor(req.query.before);
+          if (req.query.before !== undefined && !before) {
+            return res.status(400).json({ error: "Invalid cursor" });
+          }
+          const page = await storage.getClaimsPage(filter, limit, before);
+          return await sendPage(res, page, limit, claim => claim.dateSubmitted);
         }
 
-        return res.json(claims);
+        return await sendJsonArray(res, flattenBatches(storage.iterateClaims(filter, CLAIMS_LIST_BATCH_SIZE)));
       }
 
-      // Default: Return unified aggregated data
-      const allClaims = await storage.getAllClaims();
+      // Identical filters against an unchanged claims table return the memoized aggregate
+      const claimsVersion = await storage.getClaimsVersion();
+      const cacheKey = `${state ?? ''}|${district ?? ''}|${qYear ?? ''}|${qMonth ?? ''}`;
+      const cached = claimsAggregateCache.get(cacheKey);
+      if (cached && cached.version === claimsVersion) {
+        return res.json(cached.data);
+      }
+
+      // Default: Return unified aggregated data (only the columns the aggregation needs,
+      // so coordinates JSON is not parsed for every claim)
+      const allClaims = await storage.getClaimSummaries();
       const aggregatedData: any[] = [];
 
       // Group claims by state, district, year, month
@@ -628,38 +774,43 @@ export async function registerRoutes(app: Express): Promise<Server> {
         if (qYear && grpYear !== qYear) continue;
         if (qMonth && grpMonth !== qMonth) continue;
 
-        // Categorize claims by land type and status
-        const ifrClaims = claims.filter((c: any) => c.landType === 'individual');
-        const cfrClaims = claims.filter((c: any) => c.landType === 'community');
-
-        const ifrReceived = ifrClaims.length;
-        const cfrReceived = cfrClaims.length;
-        const ifrTitles = ifrClaims.filter((c: any) => c.status === 'approved').length;
-        const cfrTitles = cfrClaims.filter((c: any) => c.status === 'approved').length;
-        const ifrRejected = ifrClaims.filter((c: any) => c.status === 'rejected').length;
-        const cfrRejected = cfrClaims.filter((c: any) => c.status === 'rejected').length;
-
-        // Calculate average processing time (only for claims with valid dates)
-        const processedClaims = claims.filter((c: any) => {
-          const hasProcessed = c.dateProcessed;
-          const hasSubmitted = c.dateSubmitted || c.createdAt;
-          return hasProcessed && hasSubmitted;
-        });
-
-        const processingTimes = processedClaims.map((c: any) => {
-          const submitted = new Date(c.dateSubmitted || c.createdAt);
-          const processed = new Date(c.dateProcessed);
-
-          // Validate both dates to prevent NaN
-          if (isNaN(submitted.getTime()) || isNaN(processed.getTime())) {
-            return 0; // Safe fallback
+        // Count received/approved/rejected claims per land type and average processing
+        // time in a single pass over the group
+        let ifrReceived = 0, cfrReceived = 0;
+        let ifrTitles = 0, cfrTitles = 0;
+        let ifrRejected = 0, cfrRejected = 0;
+        let processingDaysSum = 0;
+        let processingDaysCount = 0;
+
+        for (const c of claims) {
+          if (c.landType === 'individual') {
+            ifrReceived++;
+            if (c.status === 'approved') ifrTitles++;
+            else if (c.status === 'rejected') ifrRejected++;
+          } else if (c.landType === 'community') {
+            cfrReceived++;
+            if (c.status === 'approved') cfrTitles++;
+            else if (c.status === 'rejected') cfrRejected++;
           }
 
-          return Math.round((processed.getTime() - submitted.getTime()) / (1000 * 60 * 60 * 24));
-        }).filter((days: number) => days >= 0); // Filter out negative/invalid times
+          // Only claims with valid processed and submitted dates count towards processing time
+          const submittedAt = c.dateSubmitted || c.createdAt;
+          if (!c.dateProcessed || !submittedAt) continue;
+          const submitted = new Date(submittedAt).getTime();
+          const processed = new Date(c.dateProcessed).getTime();
+
+          // Invalid dates count as 0 days; negative durations are ignored
+          const days = isNaN(submitted) || isNaN(processed)
+            ? 0
+            : Math.round((processed - submitted) / (1000 * 60 * 60 * 24));
+          if (days >= 0) {
+            processingDaysSum += days;
+            processingDaysCount++;
+          }
+        }
 
-        const avgProcessingTime = processingTimes.length > 0
-          ? Math.round(processingTimes.reduce((a: number, b: number) => a + b, 0) / processingTimes.length)
+        const avgProcessingTime = processingDaysCount > 0
+          ? Math.round(processingDaysSum / processingDaysCount)
           : 0;
 
         aggregatedData.push({
@@ -678,6 +829,11 @@ export async function registerRoutes(app: Express): Promise<Server> {
         });
       }
 
+      if (claimsAggregateCache.size >= CLAIMS_AGGREGATE_CACHE_MAX_ENTRIES && !claimsAggregateCache.has(cacheKey)) {
+        claimsAggregateCache.delete(claimsAggregateCache.keys().next().value!);
+      }
+      claimsAggregateCache.set(cacheKey, { version: claimsVersion, data: aggregatedData });
+
       res.json(aggregatedData);
     } catch (error) {
       console.error('Unified claims API error:', error);
@@ -716,6 +872,79 @@ export async function registerRoutes(app: Express): Promise<Server> {
     return grouped;
   }
 
+  const CLAIMS_EXPORT_BATCH_SIZE = 1000;
+
+  // Export claims to CSV (registered before /api/claims/:id, which would otherwise match "export")
+  app.get("/api/claims/export", requireAuth, async (req, res) => {
+    try {
+      const user = (req as any).user;
+
+      // Role-based filtering is done in SQL so out-of-jurisdiction rows are never loaded
+      const filter: { state?: string; district?: string } = {};
+      if (user.role === 'state' && user.stateId) {
+        const userState = await storage.getState(user.stateId);
+        if (userState) {
+          filter.state = userState.name;
+        }
+      } else if (user.role === 'district' && user.districtId) {
+        const userDistrict = await storage.getDistrict(user.districtId);
+        if (userDistrict) {
+          filter.district = userDistrict.name;
+        }
+      }
+
+      res.setHeader('Content-Type', 'text/csv');
+      res.setHeader('Content-Disposition', `attachment; filename="fra-claims-${new Date().toISOString().split('T')[0]}.csv"`);
+      res.write('ID,Claim ID,Claimant Name,Location,District,State,Area (hectares),Land Type,Status,Date Submitted,Date Processed,Family Members,Notes\n');
+
+      // Claims are read CLAIMS_EXPORT_BATCH_SIZE rows at a time and each batch is written as one
+      // chunk, so memory stays bounded by the batch and the download starts immediately
+      let exportedCount = 0;
+      for await (const batch of storage.iterateClaims(filter, CLAIMS_EXPORT_BATCH_SIZE)) {
+        const chunk = batch.map(claim => [
+          claim.id,
+          claim.claimId,
+          claim.claimantName,
+          claim.location,
+          claim.district,
+          claim.state,
+          claim.area,
+          claim.landType,
+          claim.status,
+          claim.dateSubmitted.toISOString().split('T')[0],
+          claim.dateProcessed ? claim.dateProcessed.toISOString().split('T')[0] : '',
+          claim.familyMembers || '',
+          claim.notes
+        ].map(csvField).join(',') + '\n').join('');
+
+        exportedCount += batch.length;
+        if (!res.write(chunk)) {
+          await waitForDrain(res);
+        }
+        if (res.destroyed) return;
+      }
+      res.end();
+
+      // Log the export
+      await storage.logAudit({
+        userId: user.id,
+        action: "export_claims",
+        resourceType: "claims",
+        resourceId: "bulk",
+        changes: { exported_count: exportedCount },
+        ipAddress: req.ip || null,
+        userAgent: req.get('User-Agent') || null
+      });
+    } catch (error) {
+      console.error('Export error:', error);
+      if (!res.headersSent) {
+        res.status(500).json({ error: "Failed to export claims data" });
+      } else {
+        res.end();
+      }
+    }
+  });
+
   app.get("/api/claims/:id", requireAuth, async (req, res) => {
     try {
       const claim = await storage.getClaim(req.params.id);
@@ -759,7 +988,10 @@ export async function registerRoutes(app: Express): Promise<Server> {
 
   app.patch("/api/claims/:id", requireAuth, requireRole("ministry", "state", "district"), async (req: any, res) => {
     try {
-      const updates = req.body;
+      // Drop unknown and server-managed keys before they reach the UPDATE
+      const updates = Object.fromEntries(
+        Object.entries(req.body ?? {}).filter(([key]) => CLAIM_UPDATABLE_FIELDS.has(key))
+      );
       const claim = await storage.updateClaim(req.params.id, updates);
       if (!claim) {
         return res.status(404).json({ error: "Claim not found" });
@@ -841,12 +1073,12 @@ export async function registerRoutes(app: Express): Promise<Server> {
     try {
       // Use already validated session and user from requireAuth middleware
       const { reason } = req.body;
-      const existingClaim = await storage.getClaim(req.params.id);
+      // Notes are only overwritten when a reason is given, so no prior read of the claim is needed
       const claim = await storage.updateClaim(req.params.id, {
         status: "rejected",
         dateProcessed: new Date(),
         assignedOfficer: req.user.id,
-        notes: reason || existingClaim?.notes
+        ...(reason ? { notes: reason } : {})
       });
 
       if (!claim) {
@@ -892,30 +1124,72 @@ export async function registerRoutes(app: Express): Promise<Server> {
   app.get("/api/documents", requireAuth, async (req, res) => {
     try {
       const { claimId, status } = req.query;
-      let documents = await storage.getAllDocuments();
 
-      if (claimId) {
-        documents = await storage.getDocumentsByClaim(claimId as string);
-      } else if (status) {
-        documents = await storage.getDocumentsByStatus(status as string);
+      // List queries never select fileContent, so no sanitizing is needed
+      const limit = parsePageLimit(req.query.limit);
+      if (limit) {
+        const before = parsePageCursor(req.query.before);
+        if (req.query.before !== undefined && !before) {
+          return res.status(400).json({ error: "Invalid cursor" });
+        }
+        const filter = claimId ? { claimId: claimId as string } : status ? { ocrStatus: status as string } : {};
+        const page = await storage.getDocumentsPage(filter, limit, before);
+        return await sendPage(res, page, limit, document => document.createdAt);
       }
 
-      // Sanitize documents to exclude fileContent from response
-      res.json(sanitizeDocuments(documents));
+      const documents = claimId
+        ? await storage.getDocumentsByClaim(claimId as string)
+        : status
+          ? await storage.getDocumentsByStatus(status as string)
+          : await storage.getAllDocuments();
+
+      await sendJsonArray(res, documents);
     } catch (error) {
       res.status(500).json({ error: "Failed to fetch documents" });
     }
   });
 
-  // File content is now stored directly in database, no temporary storage needed
+  // OCR runs in the background through a bounded in-process queue, so the upload
+  // request returns immediately and bursts of uploads don't start unbounded OCR jobs.
+  // Each Tesseract worker is single-threaded, so by default run one job per core, leaving one
+  // core for the event loop, but no more than 4: every job can also fan out to Gemini.
+  const DEFAULT_OCR_CONCURRENCY = Math.min(4, Math.max(1, os.availableParallelism() - 1));
+  const OCR_CONCURRENCY = Math.max(1, parseInt(process.env.OCR_CONCURRENCY || '', 10) || DEFAULT_OCR_CONCURRENCY);
+  // Resident Tesseract workers each hold all six language models (several hundred MB), so the
+  // pool can be sized separately; more workers than concurrent jobs would never be used.
+  const OCR_POOL_SIZE = Math.min(OCR_CONCURRENCY,
+    Math.max(1, parseInt(process.env.OCR_WORKERS || '', 10) || OCR_CONCURRENCY));
+  const ocrQueue: string[] = [];
+  let activeOcrJobs = 0;
+
+  function enqueueDocumentOCR(documentId: string) {
+    ocrQueue.push(documentId);
+    drainOCRQueue();
+  }
+
+  function drainOCRQueue() {
+    while (activeOcrJobs < OCR_CONCURRENCY && ocrQueue.length > 0) {
+      const documentId = ocrQueue.shift()!;
+      activeOcrJobs++;
+      processDocumentOCR(documentId)
+        .catch(console.error)
+        .finally(() => {
+          activeOcrJobs--;
+          drainOCRQueue();
+        });
+    }
+  }
 
   // Real OCR Processing function
   async function processDocumentOCR(documentId: string) {
     try {
-      // Update status to processing
-      await storage.updateDocument(documentId, {
+      // Update status to processing; RETURNING gives the document details without a second query
+      const document = await storage.updateDocument(documentId, {
         ocrStatus: 'processing'
       });
+      if (!document) {
+        throw new Error('Document not found');
+      }
 
       // Broadcast real-time event for OCR processing start
       (app as any).broadcastEvent({
@@ -927,26 +1201,18 @@ export async function registerRoutes(app: Express): Promise<Server> {
         targetRoles: ['ministry', 'state', 'district', 'village']
       });
 
-      // Get document details
-      const document = await storage.getDocument(documentId);
-      if (!document) {
-        throw new Error('Document not found');
-      }
-
-      // Get the file buffer from database
-      const fileBuffer = document.fileContent as Buffer | null;
+      // Load the file from disk (or the legacy database BLOB)
+      const fileBuffer = await readDocumentContent(document);
       if (!fileBuffer) {
-        throw new Error('File content not found in database');
+        throw new Error('File content not found');
       }
 
       console.log(`Starting real OCR processing for ${document.originalFilename} (${document.fileType})`);
 
       // AI-powered OCR and data extraction
-      const ocrText = await extractTextFromDocument(document, fileBuffer);
+      const { text: ocrText, confidence: ocrConfidence } = await extractTextFromDocument(document, fileBuffer);
       const extractedData = await extractStructuredDataWithAI(document, fileBuffer, ocrText);
-      const confidence = extractedData.confidence || calculateConfidence(ocrText, document);
-
-      // File content is stored permanently in database, no cleanup needed
+      const confidence = resolveOCRConfidence(ocrConfidence, extractedData.confidence, () => calculateConfidence(ocrText, document));
 
       // Update document with OCR results
       await storage.updateDocument(documentId, {
@@ -978,7 +1244,7 @@ export async function registerRoutes(app: Express): Promise<Server> {
         if (error.message.includes('Document not found')) {
           errorMessage = 'Document not found';
         } else if (error.message.includes('File content not found')) {
-          errorMessage = 'File content missing from database';
+          errorMessage = 'File content missing';
         } else if (error.message.includes('Unsupported file type')) {
           errorMessage = 'File type not supported for OCR';
         } else if (error.message.includes('No text')) {
@@ -988,7 +1254,7 @@ export async function registerRoutes(app: Express): Promise<Server> {
         }
       }
 
-      // File content remains in database for potential retry
+      // File content is kept for potential retry
       await storage.updateDocument(documentId, {
         ocrStatus: 'failed'
       });
@@ -1007,7 +1273,8 @@ export async function registerRoutes(app: Express): Promise<Server> {
   }
 
   // Extract text from document using AI-powered OCR
-  async function extractTextFromDocument(document: any, fileBuffer: Buffer): Promise<string> {
+  // confidence is only set when Tesseract ran and measured it (0-100)
+  async function extractTextFromDocument(document: any, fileBuffer: Buffer): Promise<{ text: string; confidence: number | null }> {
     try {
       const fileType = document.fileType;
       console.log(`Extracting text from ${fileType} file: ${document.originalFilename}`);
@@ -1016,74 +1283,119 @@ export async function registerRoutes(app: Express): Promise<Server> {
         // For now, analyze PDF metadata and encourage user to convert to image
         console.log('PDF detected - analyzing file...');
         const sizeKB = Math.round(fileBuffer.length / 1024);
-        return `PDF Document Analysis:\n\nFilename: ${document.originalFilename}\nSize: ${sizeKB} KB\nPages: Estimated ${Math.ceil(sizeKB / 50)} pages\n\nNote: For best OCR results with PDFs, please:\n1. Convert PDF pages to high-quality images (JPG/PNG)\n2. Or use PDFs with selectable text\n\nThis PDF was uploaded successfully. To extract text, please upload as an image file.`;
+        return {
+          text: `PDF Document Analysis:\n\nFilename: ${document.originalFilename}\nSize: ${sizeKB} KB\nPages: Estimated ${Math.ceil(sizeKB / 50)} pages\n\nNote: For best OCR results with PDFs, please:\n1. Convert PDF pages to high-quality images (JPG/PNG)\n2. Or use PDFs with selectable text\n\nThis PDF was uploaded successfully. To extract text, please upload as an image file.`,
+          confidence: null
+        };
       } else if (fileType.startsWith('image/')) {
         // AI-powered text extraction with Gemini
         console.log('Processing image with AI-powered OCR...');
         try {
           const aiResult = await extractText(fileBuffer, fileType);
-          return aiResult.text;
+          return { text: aiResult.text, confidence: null };
         } catch (aiError) {
           console.log('AI OCR failed, falling back to Tesseract:', aiError);
           return await extractTextFromImageBuffer(fileBuffer, document.originalFilename);
         }
       } else {
-        return `Unsupported file type: ${fileType}. Please upload PDF, JPEG, PNG, or TIFF files.`;
+        return { text: `Unsupported file type: ${fileType}. Please upload PDF, JPEG, PNG, or TIFF files.`, confidence: null };
       }
     } catch (error: any) {
       console.error('Text extraction error:', error);
-      return `Error extracting text from document: ${error?.message || error}`;
+      return { text: `Error extracting text from document: ${error?.message || error}`, confidence: null };
     }
   }
 
   // Extract text from image using enhanced Tesseract OCR with multi-language support
-  async function extractTextFromImageBuffer(imageBuffer: Buffer, filename: string): Promise<string> {
-    let worker = null;
+  // Comprehensive Indian language support for all major languages used in FRA documentation
+  const OCR_LANGUAGES = ['eng', 'hin', 'ori', 'tel', 'ben', 'guj'];
+  // Where tesseract.js keeps downloaded *.traineddata between runs (defaults to the working directory)
+  const OCR_TRAINEDDATA_CACHE_DIR = process.env.OCR_TRAINEDDATA_CACHE_DIR || '.';
+
+  // Starting a Tesseract worker loads every language model, which takes far longer than a
+  // typical recognize() call. A pool of OCR_POOL_SIZE workers is started on first use and
+  // kept for the life of the process; jobs are spread across the pool's worker threads.
+  let ocrScheduler: Promise<Scheduler> | null = null;
+
+  function getOCRScheduler(): Promise<Scheduler> {
+    if (!ocrScheduler) {
+      ocrScheduler = (async () => {
+        const scheduler = createScheduler();
+        const startWorker = async () => {
+          const worker = await createWorker(OCR_LANGUAGES, undefined, { cachePath: OCR_TRAINEDDATA_CACHE_DIR });
+
+          try {
+            // Configure OCR for government document processing
+            await worker.setParameters({
+              tessedit_char_whitelist: 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789.,()-/:; ' +
+                'अआइईउऊएऐओऔकखगघङचछजझञटठडढणतथदधनपफबभमयरलवशषसह' + // Hindi
+                'ଅଆଇଈଉଊଏଐଓଔକଖଗଘଙଚଛଜଝଞଟଠଡଢଣତଥଦଧନପଫବଭମଯରଲଵଶଷସହ' + // Odia
+                'అआইईউేైొౌకఃగఘఙచఛజఝఞటఠడఢణతథదధనపఫబభమయరలవశషసహ' + // Telugu
+                'অআইঈউঊএঐওঔকখগঘঙচছজঝঞটঠডঢণতথদধনপফবভমযরলশষসহ' + // Bengali
+                'અઆઇઈઉઊએઐઓઔકખગઘઙચછજઝઞટઠડઢણતથદધનપફબભમયરલવશષસહ', // Gujarati
+              tessedit_pageseg_mode: PSM.SINGLE_BLOCK, // Uniform block of text
+              preserve_interword_spaces: '1',
+              user_defined_dpi: '300',
+              // Scanned claim forms are dark text on light paper; skip the second, inverted-image
+              // recognition pass Tesseract otherwise runs on low-confidence lines
+              tessedit_do_invert: '0'
+            });
+          } catch (error) {
+            await worker.terminate();
+            throw error;
+          }
+          return worker;
+        };
+        // The first worker fetches any missing traineddata into the cache; the rest then load it
+        // from disk instead of all downloading the same language models at once
+        const firstWorker = await startWorker();
+        const started = await Promise.allSettled(Array.from({ length: OCR_POOL_SIZE - 1 }, startWorker));
+        const workers = [firstWorker];
+        let startError: unknown = null;
+        for (const result of started) {
+          if (result.status === 'fulfilled') {
+            workers.push(result.value);
+          } else if (!startError) {
+            startError = result.reason;
+          }
+        }
+        if (startError) {
+          // Each worker holds every language model; don't leave the ones that did start running
+          await Promise.allSettled(workers.map(worker => worker.terminate()));
+          throw startError;
+        }
+        workers.forEach(worker => scheduler.addWorker(worker));
+        console.log(`Tesseract worker pool ready (${workers.length} workers)`);
+        return scheduler;
+      })().catch(error => {
+        // Allow the next OCR job to retry pool creation
+        ocrScheduler = null;
+        throw error;
+      });
+    }
+    return ocrScheduler;
+  }
+
+  async function extractTextFromImageBuffer(imageBuffer: Buffer, filename: string): Promise<{ text: string; confidence: number | null }> {
     try {
       console.log(`Starting enhanced multi-language OCR for image: ${filename}`);
 
-      // Create Tesseract worker with comprehensive Indian language support
-      // Supports all major languages used in FRA documentation
-      const languages = ['eng', 'hin', 'ori', 'tel', 'ben', 'guj'];
-      worker = await createWorker(languages);
-
-      // Configure OCR for government document processing
-      await worker.setParameters({
-        tessedit_char_whitelist: 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789.,()-/:; ' +
-          'अआइईउऊएऐओऔकखगघङचछजझञटठडढणतथदधनपफबभमयरलवशषसह' + // Hindi
-          'ଅଆଇଈଉଊଏଐଓଔକଖଗଘଙଚଛଜଝଞଟଠଡଢଣତଥଦଧନପଫବଭମଯରଲଵଶଷସହ' + // Odia
-          'అआইईউేైొౌకఃగఘఙచఛజఝఞటఠడఢణతథదధనపఫబభమయరలవశషసహ' + // Telugu
-          'অআইঈউঊএঐওঔকখগঘঙচছজঝঞটঠডঢণতথদধনপফবভমযরলশষসহ' + // Bengali
-          'અઆઇઈઉઊએઐઓઔકખગઘઙચછજઝઞટઠડઢણતથદધનપફબભમયરલવશષસહ', // Gujarati
-        tessedit_pageseg_mode: PSM.SINGLE_BLOCK, // Uniform block of text
-        preserve_interword_spaces: '1',
-        user_defined_dpi: '300'
-      });
-
-      // Perform OCR on the image buffer
-      const { data: { text, confidence } } = await worker.recognize(imageBuffer);
+      // Perform OCR on the image buffer using a pooled, pre-initialized worker
+      const scheduler = await getOCRScheduler();
+      const { data: { text, confidence } } = await scheduler.addJob('recognize', imageBuffer);
 
       console.log(`Enhanced OCR completed with confidence: ${confidence}%`);
       console.log(`Extracted text length: ${text.length} characters`);
-      console.log(`Languages detected: ${languages.join(', ')}`);
+      console.log(`Languages detected: ${OCR_LANGUAGES.join(', ')}`);
 
       if (text && text.trim().length > 0) {
-        return text.trim();
+        return { text: text.trim(), confidence };
       } else {
-        return `No text could be extracted from the image. The image may be too blurry, have poor contrast, or contain no readable text. Supported languages: English, Hindi, Odia, Telugu, Bengali, Gujarati.`;
+        return { text: `No text could be extracted from the image. The image may be too blurry, have poor contrast, or contain no readable text. Supported languages: English, Hindi, Odia, Telugu, Bengali, Gujarati.`, confidence };
       }
     } catch (error: any) {
       console.error('Enhanced OCR error:', error);
-      return `OCR processing failed: ${error?.message || error}. Please ensure the image is clear and contains readable text in one of the supported languages (English, Hindi, Odia, Telugu, Bengali, Gujarati).`;
-    } finally {
-      // Clean up the worker
-      if (worker) {
-        try {
-          await worker.terminate();
-        } catch (cleanupError) {
-          console.error('Error cleaning up Tesseract worker:', cleanupError);
-        }
-      }
+      return { text: `OCR processing failed: ${error?.message || error}. Please ensure the image is clear and contains readable text in one of the supported languages (English, Hindi, Odia, Telugu, Bengali, Gujarati).`, confidence: null };
     }
   }
 
@@ -1119,6 +1431,42 @@ export async function registerRoutes(app: Express): Promise<Server> {
   }
 
   // Enhanced structured data extraction with government compliance rules
+  // OCR classification and field patterns are compiled once when routes are registered, not per
+  // document or per line. Keyword lists become a single alternation scanned in one pass; they are
+  // matched against lowercased text, like the substring checks they replace.
+  function keywordPattern(keywords: string[]): RegExp {
+    return new RegExp(keywords.map(keyword => keyword.replace(/[.*+?^${}()|[\]\\]/g, '\\$&')).join('|'));
+  }
+
+  // Enhanced FRA document detection with multilingual support
+  const FRA_KEYWORDS = keywordPattern([
+    'forest rights', 'fra', 'वन अधिकार', 'ବନ ଅଧିକାର', 'అరణ్య హక్కులు',
+    'বন অধিকার', 'વન અધિકાર', 'forest right act', 'scheduled tribes'
+  ]);
+  const IDENTITY_KEYWORDS = keywordPattern(['aadhaar', 'आधार', 'identity', 'पहचान', 'voter', 'मतदाता', 'driving', 'passport']);
+  const SURVEY_KEYWORDS = keywordPattern(['survey', 'settlement', 'revenue', 'सर्वेक्षण', 'बंदोबस्त', 'राजस्व', 'khata', 'खाता']);
+  const INDIVIDUAL_LAND_KEYWORDS = keywordPattern(['individual', 'व्यक्तिगत', 'ବ୍ୟକ୍ତିଗତ']);
+  const COMMUNITY_LAND_KEYWORDS = keywordPattern(['community', 'सामुदायिक', 'ସାମୁଦାୟିକ']);
+
+  // Enhanced claim number patterns (FRA-STATE-YEAR-NUMBER format)
+  const CLAIM_NUMBER_PATTERN = /(?:claim|application|आवेदन)[\s\w]*?[\:\-\s]*([a-z]{2,3}[-\/]\d{4}[-\/]\d{4,6}|fra[-\/][a-z]{2}[-\/]\d{4}[-\/]\d{4,6})/i;
+
+  // Enhanced name extraction with multilingual support
+  const NAME_PATTERNS = [
+    /(?:name|नाम|ନାମ|పేరు|নাম|નામ)[\s\:]*([a-zA-Z\u0900-\u097F\u0B00-\u0B7F\u0C00-\u0C7F\u0980-\u09FF\u0A80-\u0AFF\s]{2,50})/i,
+    /(?:applicant|आवेदक|ଆବେଦନକାରୀ|దరఖాస్తుదారు|আবেদনকারী|અરજદાર)[\s\:]*([a-zA-Z\u0900-\u097F\u0B00-\u0B7F\u0C00-\u0C7F\u0980-\u09FF\u0A80-\u0AFF\s]{2,50})/i
+  ];
+
+  // Enhanced location extraction
+  const LOCATION_PATTERNS: [string, RegExp][] = [
+    ['village', /(?:village|gram|गाँव|ଗାଁ|గ్రామం|গ্রাম|ગામ)[\s\:]*([a-zA-Z\u0900-\u097F\u0B00-\u0B7F\u0C00-\u0C7F\u0980-\u09FF\u0A80-\u0AFF\s]{2,30})/i],
+    ['district', /(?:district|जिला|ଜିଲ୍ଲା|జిల్లా|জেলা|જિલ્લો)[\s\:]*([a-zA-Z\u0900-\u097F\u0B00-\u0B7F\u0C00-\u0C7F\u0980-\u09FF\u0A80-\u0AFF\s]{2,30})/i],
+    ['state', /(?:state|राज्य|ରାଜ୍ୟ|రాష్ట్రం|রাজ্য|રાજ્ય)[\s\:]*([a-zA-Z\u0900-\u097F\u0B00-\u0B7F\u0C00-\u0C7F\u0980-\u09FF\u0A80-\u0AFF\s]{2,30})/i]
+  ];
+
+  // Enhanced area measurement with multiple units
+  const AREA_PATTERN = /(\d+\.?\d*)\s*(hectare|acre|ha|हेक्टेयर|एकड़|ହେକ୍ଟର|హెక్టార్|হেক্টর|હેક્ટર)/i;
+
   async function extractStructuredData(ocrText: string, document: any): Promise<any> {
     const extractedData: any = {
       documentType: 'Unknown',
@@ -1136,13 +1484,7 @@ export async function registerRoutes(app: Express): Promise<Server> {
     const text = ocrText.toLowerCase();
     const lines = ocrText.split('\n').filter(line => line.trim().length > 0);
 
-    // Enhanced FRA document detection with multilingual support
-    const fraKeywords = [
-      'forest rights', 'fra', 'वन अधिकार', 'ବନ ଅଧିକାର', 'అరణ్య హక్కులు',
-      'বন অধিকার', 'વન અધિકાર', 'forest right act', 'scheduled tribes'
-    ];
-
-    const isFRADocument = fraKeywords.some(keyword => text.includes(keyword));
+    const isFRADocument = FRA_KEYWORDS.test(text);
 
     if (isFRADocument) {
       extractedData.documentType = 'FRA Claim Form';
@@ -1179,19 +1521,12 @@ export async function registerRoutes(app: Express): Promise<Server> {
     for (const line of lines) {
       const lowerLine = line.toLowerCase();
 
-      // Enhanced claim number patterns (FRA-STATE-YEAR-NUMBER format)
-      const claimPattern = /(?:claim|application|आवेदन)[\s\w]*?[\:\-\s]*([a-z]{2,3}[-\/]\d{4}[-\/]\d{4,6}|fra[-\/][a-z]{2}[-\/]\d{4}[-\/]\d{4,6})/i;
-      const claimMatch = line.match(claimPattern);
+      const claimMatch = line.match(CLAIM_NUMBER_PATTERN);
       if (claimMatch) {
         fields.claimNumber = claimMatch[1].toUpperCase();
       }
 
-      // Enhanced name extraction with multilingual support
-      const namePatterns = [
-        /(?:name|नाम|ନାମ|పేరు|নাম|નામ)[\s\:]*([a-zA-Z\u0900-\u097F\u0B00-\u0B7F\u0C00-\u0C7F\u0980-\u09FF\u0A80-\u0AFF\s]{2,50})/i,
-        /(?:applicant|आवेदक|ଆବେଦନକାରୀ|దరఖాస్తుదారు|আবেদনকারী|અરજદાર)[\s\:]*([a-zA-Z\u0900-\u097F\u0B00-\u0B7F\u0C00-\u0C7F\u0980-\u09FF\u0A80-\u0AFF\s]{2,50})/i
-      ];
-      for (const pattern of namePatterns) {
+      for (const pattern of NAME_PATTERNS) {
         const nameMatch = line.match(pattern);
         if (nameMatch && !fields.applicantName) {
           fields.applicantName = nameMatch[1].trim();
@@ -1199,34 +1534,24 @@ export async function registerRoutes(app: Express): Promise<Server> {
         }
       }
 
-      // Enhanced location extraction
-      const locationPatterns = [
-        /(?:village|gram|गाँव|ଗାଁ|గ్రామం|গ্রাম|ગામ)[\s\:]*([a-zA-Z\u0900-\u097F\u0B00-\u0B7F\u0C00-\u0C7F\u0980-\u09FF\u0A80-\u0AFF\s]{2,30})/i,
-        /(?:district|जिला|ଜିଲ୍ଲା|జిల్లా|জেলা|જિલ્લો)[\s\:]*([a-zA-Z\u0900-\u097F\u0B00-\u0B7F\u0C00-\u0C7F\u0980-\u09FF\u0A80-\u0AFF\s]{2,30})/i,
-        /(?:state|राज्य|ରାଜ୍ୟ|రాష్ట్రం|রাজ্য|રાજ્ય)[\s\:]*([a-zA-Z\u0900-\u097F\u0B00-\u0B7F\u0C00-\u0C7F\u0980-\u09FF\u0A80-\u0AFF\s]{2,30})/i
-      ];
-      locationPatterns.forEach((pattern, index) => {
+      for (const [fieldName, pattern] of LOCATION_PATTERNS) {
+        if (fields[fieldName]) continue;
         const match = line.match(pattern);
         if (match) {
-          const fieldNames = ['village', 'district', 'state'];
-          if (!fields[fieldNames[index]]) {
-            fields[fieldNames[index]] = match[1].trim();
-          }
+          fields[fieldName] = match[1].trim();
         }
-      });
+      }
 
-      // Enhanced area measurement with multiple units
-      const areaPattern = /(\d+\.?\d*)\s*(hectare|acre|ha|हेक्टेयर|एकड़|ହେକ୍ଟର|హెక్టార్|হেক্টর|હેક્ટર)/i;
-      const areaMatch = line.match(areaPattern);
+      const areaMatch = line.match(AREA_PATTERN);
       if (areaMatch && !fields.area) {
         fields.area = parseFloat(areaMatch[1]);
         fields.areaUnit = areaMatch[2];
       }
 
       // Land type detection
-      if ((lowerLine.includes('individual') || lowerLine.includes('व्यक्तिगत') || lowerLine.includes('ବ୍ୟକ୍ତିଗତ')) && !fields.landType) {
+      if (!fields.landType && INDIVIDUAL_LAND_KEYWORDS.test(lowerLine)) {
         fields.landType = 'individual';
-      } else if ((lowerLine.includes('community') || lowerLine.includes('सामुदायिक') || lowerLine.includes('ସାମୁଦାୟିକ')) && !fields.landType) {
+      } else if (!fields.landType && COMMUNITY_LAND_KEYWORDS.test(lowerLine)) {
         fields.landType = 'community';
       }
     }
@@ -1250,13 +1575,11 @@ export async function registerRoutes(app: Express): Promise<Server> {
   }
 
   function isIdentityDocument(text: string): boolean {
-    const identityKeywords = ['aadhaar', 'आधार', 'identity', 'पहचान', 'voter', 'मतदाता', 'driving', 'passport'];
-    return identityKeywords.some(keyword => text.includes(keyword));
+    return IDENTITY_KEYWORDS.test(text);
   }
 
   function isSurveyDocument(text: string): boolean {
-    const surveyKeywords = ['survey', 'settlement', 'revenue', 'सर्वेक्षण', 'बंदोबस्त', 'राजस्व', 'khata', 'खाता'];
-    return surveyKeywords.some(keyword => text.includes(keyword));
+    return SURVEY_KEYWORDS.test(text);
   }
 
   async function extractIdentityFields(lines: string[], extractedData: any): Promise<void> {
@@ -1295,8 +1618,12 @@ export async function registerRoutes(app: Express): Promise<Server> {
   }
 
   // Document file upload endpoint
-  app.post("/api/documents/upload", requireAuth, requireRole("ministry", "state", "district", "village"), upload.single("document"), async (req, res) => {
+  app.post("/api/documents/upload", requireAuth, requireRole("ministry", "state", "district", "village"), documentUpload.single("document"), async (req, res) => {
     try {
+      // File type was validated by the uploader's fileFilter
+      if ((req as any).unsupportedFileType) {
+        return res.status(415).json({ error: "Unsupported file type. Please upload PDF, JPG, PNG, or TIFF files." });
+      }
       if (!req.file) {
         return res.status(400).json({ error: "No file uploaded" });
       }
@@ -1304,25 +1631,14 @@ export async function registerRoutes(app: Express): Promise<Server> {
       const user = (req as any).user;
       const file = req.file;
 
-      // Validate file type
-      const allowedTypes = ['application/pdf', 'image/jpeg', 'image/png', 'image/tiff'];
-      if (!allowedTypes.includes(file.mimetype)) {
-        return res.status(415).json({ error: "Unsupported file type. Please upload PDF, JPG, PNG, or TIFF files." });
-      }
-
-      // Validate file size (already handled by multer, but let's provide better error message)
-      if (file.size > 50 * 1024 * 1024) {
-        return res.status(413).json({ error: "File too large. Maximum file size is 50MB." });
-      }
-
-      // Create document record with file content stored in database
+      // Create document record pointing at the file on disk
       const documentData = {
-        filename: `${randomUUID()}_${file.originalname}`,
+        filename: file.filename,
         originalFilename: file.originalname,
         fileType: file.mimetype,
         fileSize: file.size,
-        uploadPath: null, // No longer needed since file is stored in database
-        fileContent: file.buffer, // Store file content directly in database
+        uploadPath: file.path,
+        fileContent: null,
         ocrStatus: 'pending' as const,
         reviewStatus: 'pending' as const,
         uploadedBy: user.id,
@@ -1331,35 +1647,118 @@ export async function registerRoutes(app: Express): Promise<Server> {
 
       const document = await storage.createDocument(documentData);
 
-      // File is now stored in database, no need for temporary buffer storage
-
-      // Start real OCR processing asynchronously
-      setImmediate(() => processDocumentOCR(document.id).catch(console.error));
+      // Queue OCR processing; clients poll /api/documents/:id/ocr-results for the outcome
+      enqueueDocumentOCR(document.id);
 
       res.status(201).json({
         id: document.id,
         filename: document.filename,
         originalFilename: document.originalFilename,
         status: 'uploaded',
-        message: 'Document uploaded successfully, OCR processing started'
+        ocrStatus: document.ocrStatus,
+        message: 'Document uploaded successfully, OCR processing queued'
       });
     } catch (error) {
       console.error('Document upload error:', error);
 
-      // Handle specific error types
-      if (error instanceof Error) {
-        if (error.message.includes('LIMIT_FILE_SIZE')) {
-          return res.status(413).json({ error: "File too large. Maximum file size is 50MB." });
-        }
-        if (error.message.includes('LIMIT_UNEXPECTED_FILE')) {
-          return res.status(400).json({ error: "Invalid file field. Please use 'document' field name." });
-        }
+      if (req.file) {
+        await fs.promises.unlink(req.file.path).catch(() => { });
       }
 
+      // Multer limit errors never reach this handler; the app-level error middleware maps them
       res.status(500).json({ error: "Failed to upload document. Please try again." });
     }
   });
 
+  // Raw document upload: the request body is the file itself (no multipart parsing).
+  // Filename comes from X-Filename (URI-encoded), type from X-File-Type or Content-Type.
+  app.post("/api/documents/raw", requireAuth, requireRole("ministry", "state", "district", "village"), async (req, res) => {
+    const user = (req as any).user;
+    const rawName = req.get('X-Filename');
+    const fileType = (req.get('X-File-Type') || req.get('Content-Type') || '').split(';')[0].trim();
+
+    if (!rawName) {
+      return res.status(400).json({ error: "Missing X-Filename header" });
+    }
+    if (!ALLOWED_DOCUMENT_TYPES.includes(fileType)) {
+      return res.status(415).json({ error: "Unsupported file type. Please upload PDF, JPG, PNG, or TIFF files." });
+    }
+    if (Number(req.get('Content-Length')) > MAX_DOCUMENT_SIZE) {
+      return res.status(413).json({ error: "File too large. Maximum file size is 50MB." });
+    }
+
+    let originalFilename: string;
+    try {
+      originalFilename = path.basename(decodeURIComponent(rawName));
+    } catch {
+      return res.status(400).json({ error: "Invalid X-Filename header" });
+    }
+
+    const filename = documentStorageFilename(originalFilename);
+    const uploadPath = path.join(DOCUMENT_UPLOAD_DIR, filename);
+    let fileSize = 0;
+
+    try {
+      // Copy the request stream to disk chunk by chunk, aborting once the size cap is exceeded
+      await pipeline(
+        req,
+        new Transform({
+          transform(chunk: Buffer, _encoding, callback) {
+            fileSize += chunk.length;
+            if (fileSize > MAX_DOCUMENT_SIZE) {
+              callback(new Error('LIMIT_FILE_SIZE'));
+            } else {
+              callback(null, chunk);
+            }
+          }
+        }),
+        fs.createWriteStream(uploadPath)
+      );
+
+      if (fileSize === 0) {
+        await fs.promises.unlink(uploadPath).catch(() => { });
+        return res.status(400).json({ error: "No file uploaded" });
+      }
+
+      const document = await storage.createDocument({
+        filename,
+        originalFilename,
+        fileType,
+        fileSize,
+        uploadPath,
+        fileContent: null,
+        ocrStatus: 'pending' as const,
+        reviewStatus: 'pending' as const,
+        uploadedBy: user.id,
+        claimId: (req.query.claimId as string) || null
+      });
+
+      enqueueDocumentOCR(document.id);
+
+      res.status(201).json({
+        id: document.id,
+        filename: document.filename,
+        originalFilename: document.originalFilename,
+        status: 'uploaded',
+        ocrStatus: document.ocrStatus,
+        message: 'Document uploaded successfully, OCR processing queued'
+      });
+    } catch (error) {
+      await fs.promises.unlink(uploadPath).catch(() => { });
+
+      if (error instanceof Error && error.message === 'LIMIT_FILE_SIZE') {
+        // Stop reading the rest of the oversized body
+        res.set('Connection', 'close');
+        return res.status(413).json({ error: "File too large. Maximum file size is 50MB." });
+      }
+
+      console.error('Raw document upload error:', error);
+      if (!res.headersSent) {
+        res.status(500).json({ error: "Failed to upload document. Please try again." });
+      }
+    }
+  });
+
   app.post("/api/documents", requireAuth, requireRole("ministry", "state", "district", "village"), async (req, res) => {
     try {
       const documentData = insertDocumentSchema.parse(req.body);
@@ -1373,7 +1772,8 @@ export async function registerRoutes(app: Express): Promise<Server> {
 
   app.get("/api/documents/:id/ocr-results", requireAuth, async (req, res) => {
     try {
-      const document = await storage.getDocument(req.params.id);
+      // Polled while OCR runs; never load the legacy file BLOB for it
+      const document = await storage.getDocumentMetadata(req.params.id);
       if (!document) {
         return res.status(404).json({ error: "Document not found" });
       }
@@ -1392,7 +1792,7 @@ export async function registerRoutes(app: Express): Promise<Server> {
     }
   });
 
-  // Serve files from database
+  // Serve document files from disk (or the legacy database BLOB)
   app.get("/api/documents/:id/download", requireAuth, async (req, res) => {
     try {
       const document = await storage.getDocument(req.params.id);
@@ -1400,19 +1800,31 @@ export async function registerRoutes(app: Express): Promise<Server> {
         return res.status(404).json({ error: "Document not found" });
       }
 
-      if (!document.fileContent) {
+      if (!document.uploadPath && !document.fileContent) {
         return res.status(404).json({ error: "File content not found" });
       }
 
       // Set appropriate headers for file download
+      res.attachment(document.originalFilename);
       res.set({
         'Content-Type': document.fileType,
-        'Content-Length': document.fileSize.toString(),
-        'Content-Disposition': `attachment; filename="${document.originalFilename}"`,
         'Cache-Control': 'private, no-cache'
       });
 
-      // Send the file content
+      if (document.uploadPath) {
+        // Behind nginx, hand the transfer to the proxy (sendfile) instead of streaming through Node
+        const accelPrefix = process.env.DOCUMENT_ACCEL_REDIRECT_PREFIX;
+        if (accelPrefix) {
+          res.set('X-Accel-Redirect', `${accelPrefix}${encodeURIComponent(path.basename(document.uploadPath))}`);
+          return res.end();
+        }
+
+        // Stream the file from disk; send handles ETag/Last-Modified revalidation and Range requests
+        return res.sendFile(path.resolve(document.uploadPath), { etag: true, lastModified: true, acceptRanges: true });
+      }
+
+      // Send the legacy file content
+      res.set('Content-Length', document.fileSize.toString());
       res.send(document.fileContent as Buffer);
     } catch (error) {
       console.error('File download error:', error);
@@ -1438,8 +1850,7 @@ export async function registerRoutes(app: Express): Promise<Server> {
         return res.status(404).json({ error: "Document not found" });
       }
 
-      // Sanitize document to exclude fileContent from response
-      res.json(sanitizeDocument(document));
+      res.json(document);
     } catch (error) {
       res.status(400).json({ error: "Failed to update OCR data" });
     }
@@ -1448,7 +1859,7 @@ export async function registerRoutes(app: Express): Promise<Server> {
   // Create claim from OCR document data
   app.post("/api/documents/:id/create-claim", requireAuth, requireRole("ministry", "state", "district"), async (req, res) => {
     try {
-      const document = await storage.getDocument(req.params.id);
+      const document = await storage.getDocumentMetadata(req.params.id);
       if (!document) {
         return res.status(404).json({ error: "Document not found" });
       }
@@ -1507,15 +1918,10 @@ export async function registerRoutes(app: Express): Promise<Server> {
   app.get("/api/ocr-review", requireAuth, async (req, res) => {
     try {
       console.log('Fetching documents for OCR review...');
-      const documents = await storage.getDocumentsByStatus('completed');
-      console.log(`Found ${documents.length} completed documents`);
-
-      const pendingReview = documents.filter(doc => doc.reviewStatus === 'pending');
+      const pendingReview = await storage.getDocumentsPendingReview();
       console.log(`Found ${pendingReview.length} documents pending review`);
 
-      // Sanitize documents to exclude fileContent from response
-      const sanitizedDocs = sanitizeDocuments(pendingReview);
-      res.json(sanitizedDocs);
+      res.json(pendingReview);
     } catch (error) {
       console.error('OCR review endpoint error:', error);
       res.status(500).json({
@@ -1529,7 +1935,7 @@ export async function registerRoutes(app: Express): Promise<Server> {
   app.get("/api/states", async (req, res) => {
     try {
       const states = await storage.getAllStates();
-      res.json(states);
+      sendReferenceData(req, res, states);
     } catch (error) {
       res.status(500).json({ error: "Failed to fetch states" });
     }
@@ -1539,7 +1945,7 @@ export async function registerRoutes(app: Express): Promise<Server> {
     try {
       const stateId = parseInt(req.params.id);
       const districts = await storage.getDistrictsByState(stateId);
-      res.json(districts);
+      sendReferenceData(req, res, districts);
     } catch (error) {
       res.status(500).json({ error: "Failed to fetch districts" });
     }
@@ -1554,15 +1960,19 @@ export async function registerRoutes(app: Express): Promise<Server> {
         return res.status(404).json({ error: "State not found" });
       }
 
-      const claims = await storage.getClaimsByState(state.name);
-      const districts = await storage.getDistrictsByState(parseInt(stateId));
+      const [claimStats, recentClaims, districts] = await Promise.all([
+        storage.getClaimStatusStats(state.name),
+        storage.getRecentClaimsByState(state.name, 10),
+        storage.getDistrictsByState(parseInt(stateId))
+      ]);
+      const claimsByStatus = new Map(claimStats.map(row => [row.status, row.count]));
 
       const stats = {
-        totalClaims: claims.length,
-        pendingClaims: claims.filter(c => c.status === 'pending').length,
-        approvedClaims: claims.filter(c => c.status === 'approved').length,
-        rejectedClaims: claims.filter(c => c.status === 'rejected').length,
-        totalArea: claims.reduce((sum, c) => sum + parseFloat(c.area.toString()), 0),
+        totalClaims: claimStats.reduce((sum, row) => sum + row.count, 0),
+        pendingClaims: claimsByStatus.get('pending') ?? 0,
+        approvedClaims: claimsByStatus.get('approved') ?? 0,
+        rejectedClaims: claimsByStatus.get('rejected') ?? 0,
+        totalArea: claimStats.reduce((sum, row) => sum + row.totalArea, 0),
         districts: districts.length
       };
 
@@ -1570,7 +1980,7 @@ export async function registerRoutes(app: Express): Promise<Server> {
         state,
         stats,
         districts,
-        recentClaims: claims.slice(-10)
+        recentClaims
       });
     } catch (error) {
       res.status(500).json({ error: "Failed to fetch state dashboard" });
@@ -1580,17 +1990,22 @@ export async function registerRoutes(app: Express): Promise<Server> {
   // Analytics routes  
   app.get("/api/analytics/processing-bottlenecks", async (req, res) => {
     try {
-      const claims = await storage.getAllClaims();
-      const documents = await storage.getAllDocuments();
+      // Status counts come straight from GROUP BY queries; no rows are loaded
+      const [claimStats, ocrCounts, reviewCounts] = await Promise.all([
+        storage.getClaimStatusStats(),
+        storage.getDocumentStatusCounts(),
+        storage.getDocumentReviewStatusCounts()
+      ]);
+      const claimsByStatus = new Map(claimStats.map(row => [row.status, row.count]));
 
       const bottlenecks = {
-        pendingOCR: documents.filter(d => d.ocrStatus === 'pending').length,
-        pendingReview: documents.filter(d => d.reviewStatus === 'pending').length,
+        pendingOCR: ocrCounts.find(row => row.ocrStatus === 'pending')?.count ?? 0,
+        pendingReview: reviewCounts.find(row => row.reviewStatus === 'pending')?.count ?? 0,
         claimsByStatus: {
-          pending: claims.filter(c => c.status === 'pending').length,
-          'under-review': claims.filter(c => c.status === 'under-review').length,
-          approved: claims.filter(c => c.status === 'approved').length,
-          rejected: claims.filter(c => c.status === 'rejected').length
+          pending: claimsByStatus.get('pending') ?? 0,
+          'under-review': claimsByStatus.get('under-review') ?? 0,
+          approved: claimsByStatus.get('approved') ?? 0,
+          rejected: claimsByStatus.get('rejected') ?? 0
         },
         averageProcessingTime: 15 // Mock calculation
       };
@@ -1611,12 +2026,17 @@ export async function registerRoutes(app: Express): Promise<Server> {
       location: rawData.location || rawData.village || rawData.village_name,
       district: rawData.district || rawData.district_name,
       state: rawData.state || rawData.state_name,
-      area: (rawData.area || rawData.area_hectares || rawData.land_area || '0').toString(),
+      area: parseFloat(rawData.area || rawData.area_hectares || rawData.land_area) || 0,
       landType: (rawData.land_type || rawData.landType || 'individual').toLowerCase(),
       status: (rawData.status || 'pending').toLowerCase(),
       dateSubmitted: rawData.date_submitted ? new Date(rawData.date_submitted) : new Date(),
       familyMembers: parseInt(rawData.family_members || rawData.familyMembers || 0) || null,
-      coordinates: rawData.coordinates ? JSON.parse(rawData.coordinates) : null,
+      // CSV cells arrive as JSON text; objects from other sources are passed through as-is
+      coordinates: !rawData.coordinates
+        ? null
+        : typeof rawData.coordinates === 'string'
+          ? JSON.parse(rawData.coordinates)
+          : rawData.coordinates,
       notes: rawData.notes || rawData.remarks || null
     };
 
@@ -1630,7 +2050,8 @@ export async function registerRoutes(app: Express): Promise<Server> {
   }
 
   // Bulk claims import from CSV/Excel
-  app.post("/api/claims/bulk-import", requireAuth, requireRole("ministry", "state", "district"), upload.single("file"), async (req, res) => {
+  const BULK_IMPORT_BATCH_SIZE = 1000;
+  app.post("/api/claims/bulk-import", requireAuth, requireRole("ministry", "state", "district"), csvUpload.single("file"), async (req, res) => {
     try {
       if (!req.file) {
         return res.status(400).json({ error: "No file uploaded" });
@@ -1647,129 +2068,102 @@ export async function registerRoutes(app: Express): Promise<Server> {
       let successCount = 0;
       let errorCount = 0;
 
-      // Parse CSV data
-      const csvData: any[] = [];
-      const readable = Readable.from(req.file.buffer.toString());
+      // Resolve the user's jurisdiction once instead of once per row
+      const userState = user.role === 'state' && user.stateId
+        ? await storage.getState(user.stateId)
+        : undefined;
+      const userDistrict = user.role === 'district' && user.districtId
+        ? await storage.getDistrict(user.districtId)
+        : undefined;
 
-      await new Promise((resolve, reject) => {
-        readable
-          .pipe(csv())
-          .on('data', (data) => csvData.push(data))
-          .on('end', resolve)
-          .on('error', reject);
+      const auditImport = (claimId: string) => storage.logAudit({
+        userId: user.id,
+        action: "bulk_import_claim",
+        resourceType: "claim",
+        resourceId: claimId,
+        changes: { imported: true, source: 'csv' },
+        ipAddress: req.ip || null,
+        userAgent: req.get('User-Agent') || null
       });
 
-      // Process each row
-      for (const row of csvData) {
+      // Valid rows are written BULK_IMPORT_BATCH_SIZE at a time, one transaction per batch.
+      // Each row gets its own savepoint, so a bad row is reported without aborting the batch.
+      let pending: { rowNumber: number; data: ReturnType<typeof standardizeClaimData> }[] = [];
+      const flushPending = async () => {
+        const batch = pending;
+        pending = [];
+        if (batch.length === 0) return;
+
+        let created: (Claim | Error)[];
+        try {
+          created = await storage.createClaims(batch.map(item => item.data));
+        } catch (error) {
+          // The batch transaction itself failed (e.g. database busy); nothing was written
+          created = batch.map(() => error instanceof Error ? error : new Error('Unknown error'));
+        }
+
+        for (let i = 0; i < batch.length; i++) {
+          const result = created[i];
+          if (result instanceof Error) {
+            errors.push(`Row ${batch[i].rowNumber}: ${result.message}`);
+            errorCount++;
+          } else {
+            results.push({ row: batch[i].rowNumber, status: 'success', claimId: result.id });
+            successCount++;
+            await auditImport(result.id);
+          }
+        }
+      };
+
+      // Stream the CSV from the spooled file and process rows as they are parsed. compose (unlike
+      // pipe) forwards read errors, so a missing or unreadable file reaches the catch below.
+      const rows = compose(fs.createReadStream(req.file.path), csv());
+      let rowNumber = 0;
+      for await (const row of rows) {
+        rowNumber++;
         try {
           const standardizedData = standardizeClaimData(row);
 
           // Role-based filtering: users can only import data for their jurisdiction
           if (user.role === 'state' && user.stateId) {
-            const userState = await storage.getState(user.stateId);
             if (userState && standardizedData.state !== userState.name) {
-              errors.push(`Row ${csvData.indexOf(row) + 1}: Cannot import claim for ${standardizedData.state} - outside jurisdiction`);
+              errors.push(`Row ${rowNumber}: Cannot import claim for ${standardizedData.state} - outside jurisdiction`);
               errorCount++;
               continue;
             }
           } else if (user.role === 'district' && user.districtId) {
-            const userDistrict = await storage.getDistrict(user.districtId);
             if (userDistrict && standardizedData.district !== userDistrict.name) {
-              errors.push(`Row ${csvData.indexOf(row) + 1}: Cannot import claim for ${standardizedData.district} - outside jurisdiction`);
+              errors.push(`Row ${rowNumber}: Cannot import claim for ${standardizedData.district} - outside jurisdiction`);
               errorCount++;
               continue;
             }
           }
 
-          const claim = await storage.createClaim(standardizedData);
-          results.push({ row: csvData.indexOf(row) + 1, status: 'success', claimId: claim.id });
-          successCount++;
-
-          // Log the import
-          await storage.logAudit({
-            userId: user.id,
-            action: "bulk_import_claim",
-            resourceType: "claim",
-            resourceId: claim.id,
-            changes: { imported: true, source: 'csv' },
-            ipAddress: req.ip || null,
-            userAgent: req.get('User-Agent') || null
-          });
+          pending.push({ rowNumber, data: standardizedData });
+          if (pending.length >= BULK_IMPORT_BATCH_SIZE) {
+            await flushPending();
+          }
         } catch (error) {
-          const errorMsg = `Row ${csvData.indexOf(row) + 1}: ${error instanceof Error ? error.message : 'Unknown error'}`;
+          const errorMsg = `Row ${rowNumber}: ${error instanceof Error ? error.message : 'Unknown error'}`;
           errors.push(errorMsg);
           errorCount++;
         }
       }
+      await flushPending();
 
       res.json({
         message: `Import completed: ${successCount} successful, ${errorCount} failed`,
-        summary: { total: csvData.length, successful: successCount, failed: errorCount },
+        summary: { total: rowNumber, successful: successCount, failed: errorCount },
         results,
         errors: errors.slice(0, 50) // Limit error details
       });
     } catch (error) {
       console.error('Bulk import error:', error);
       res.status(500).json({ error: "Failed to import claims data" });
-    }
-  });
-
-  // Export claims to CSV
-  app.get("/api/claims/export", requireAuth, async (req, res) => {
-    try {
-      const user = (req as any).user;
-      let claims = await storage.getAllClaims();
-
-      // Role-based filtering
-      if (user.role === 'state' && user.stateId) {
-        const userState = await storage.getState(user.stateId);
-        if (userState) {
-          claims = claims.filter(claim => claim.state === userState.name);
-        }
-      } else if (user.role === 'district' && user.districtId) {
-        const userDistrict = await storage.getDistrict(user.districtId);
-        if (userDistrict) {
-          claims = claims.filter(claim => claim.district === userDistrict.name);
-        }
+    } finally {
+      if (req.file) {
+        await fs.promises.unlink(req.file.path).catch(() => { });
       }
-
-      // Convert to CSV format
-      const csvHeader = 'ID,Claim ID,Claimant Name,Location,District,State,Area (hectares),Land Type,Status,Date Submitted,Date Processed,Family Members,Notes\n';
-      const csvRows = claims.map(claim => [
-        claim.id,
-        claim.claimId,
-        claim.claimantName,
-        claim.location,
-        claim.district,
-        claim.state,
-        claim.area,
-        claim.landType,
-        claim.status,
-        claim.dateSubmitted.toISOString().split('T')[0],
-        claim.dateProcessed ? claim.dateProcessed.toISOString().split('T')[0] : '',
-        claim.familyMembers || '',
-        (claim.notes || '').replace(/"/g, '""') // Escape quotes
-      ].map(field => `"${field}"`).join(','));
-
-      const csvContent = csvHeader + csvRows.join('\n');
-
-      res.setHeader('Content-Type', 'text/csv');
-      res.setHeader('Content-Disposition', `attachment; filename="fra-claims-${new Date().toISOString().split('T')[0]}.csv"`);
-      res.send(csvContent);
-
-      // Log the export
-      await storage.logAudit({
-        userId: user.id,
-        action: "export_claims",
-        resourceType: "claims",
-        resourceId: "bulk",
-        changes: { exported_count: claims.length },
-        ipAddress: req.ip || null,
-        userAgent: req.get('User-Agent') || null
-      });
-    } catch (error) {
-      console.error('Export error:', error);
-      res.status(500).json({ error: "Failed to export claims data" });
     }
   });
 
@@ -1787,43 +2181,42 @@ export async function registerRoutes(app: Express): Promise<Server> {
         return res.status(400).json({ error: "Invalid action" });
       }
 
-      const results = [];
-      const errors = [];
+      const updates: Partial<Claim> = {
+        status: action === 'approve' ? 'approved' : action === 'reject' ? 'rejected' : 'under-review',
+        assignedOfficer: user.id
+      };
 
-      for (const claimId of claimIds) {
-        try {
-          const updates: any = {
-            status: action === 'approve' ? 'approved' : action === 'reject' ? 'rejected' : 'under-review',
-            assignedOfficer: user.id
-          };
+      if (action === 'approve' || action === 'reject') {
+        updates.dateProcessed = new Date();
+      }
 
-          if (action === 'approve' || action === 'reject') {
-            updates.dateProcessed = new Date();
-          }
+      if (action === 'reject' && reason) {
+        updates.notes = reason;
+      }
 
-          if (action === 'reject' && reason) {
-            updates.notes = reason;
-          }
+      // The same update applies to every id, so one UPDATE ... WHERE id IN (...) covers them all;
+      // ids it did not touch don't exist
+      const requestedIds = Array.from(new Set(claimIds.map(String)));
+      const updatedIds = new Set(await storage.updateClaims(requestedIds, updates));
 
-          const claim = await storage.updateClaim(claimId, updates);
-          if (claim) {
-            results.push({ claimId, status: 'success' });
-
-            // Log the bulk action
-            await storage.logAudit({
-              userId: user.id,
-              action: `bulk_${action}_claim`,
-              resourceType: "claim",
-              resourceId: claimId,
-              changes: { status: updates.status, reason },
-              ipAddress: req.ip || null,
-              userAgent: req.get('User-Agent') || null
-            });
-          } else {
-            errors.push({ claimId, error: 'Claim not found' });
-          }
-        } catch (error) {
-          errors.push({ claimId, error: error instanceof Error ? error.message : 'Unknown error' });
+      const results = [];
+      const errors = [];
+      for (const claimId of requestedIds) {
+        if (updatedIds.has(claimId)) {
+          results.push({ claimId, status: 'success' });
+
+          // Log the bulk action (queued and written in one batch)
+          await storage.logAudit({
+            userId: user.id,
+            action: `bulk_${action}_claim`,
+            resourceType: "claim",
+            resourceId: claimId,
+            changes: { status: updates.status, reason },
+            ipAddress: req.ip || null,
+            userAgent: req.get('User-Agent') || null
+          });
+        } else {
+          errors.push({ claimId, error: 'Claim not found' });
         }
       }
 
@@ -2170,28 +2563,39 @@ export async function registerRoutes(app: Express): Promise<Server> {
 
       const analytics = {
         total: workflows.length,
-        active: workflows.filter(w => w.status === 'active').length,
-        completed: workflows.filter(w => w.status === 'completed').length,
-        paused: workflows.filter(w => w.status === 'paused').length,
+        active: 0,
+        completed: 0,
+        paused: 0,
         avgCompletionTime: 0,
         stepStats: {}
       };
 
-      // Calculate average completion time for completed workflows
-      const completed = workflows.filter(w => w.status === 'completed' && w.completedAt);
-      if (completed.length > 0) {
-        const totalTime = completed.reduce((sum, w) => {
-          // w.completedAt is guaranteed to exist due to filter above
-          const completedTime = new Date(w.completedAt!).getTime();
+      // Status counts and completion time in one pass
+      let completedWithTime = 0;
+      let totalTime = 0;
+      for (const w of workflows) {
+        if (w.status === 'active') {
+          analytics.active++;
+        } else if (w.status === 'paused') {
+          analytics.paused++;
+        } else if (w.status === 'completed') {
+          analytics.completed++;
+          if (!w.completedAt) continue;
+          completedWithTime++;
+
           // Skip entries without startedAt or with invalid dates
-          if (!w.startedAt) return sum;
+          if (!w.startedAt) continue;
+          const completedTime = new Date(w.completedAt).getTime();
           const startTime = new Date(w.startedAt).getTime();
-          if (isNaN(startTime) || isNaN(completedTime)) return sum;
+          if (isNaN(startTime) || isNaN(completedTime)) continue;
           // Ensure non-negative duration
-          const duration = Math.max(0, completedTime - startTime);
-          return sum + duration;
-        }, 0);
-        analytics.avgCompletionTime = Math.round(totalTime / completed.length / (1000 * 60 * 60)); // hours
+          totalTime += Math.max(0, completedTime - startTime);
+        }
+      }
+
+      // Calculate average completion time for completed workflows
+      if (completedWithTime > 0) {
+        analytics.avgCompletionTime = Math.round(totalTime / completedWithTime / (1000 * 60 * 60)); // hours
       }
 
       res.json(analytics);
@@ -2209,7 +2613,7 @@ export async function registerRoutes(app: Express): Promise<Server> {
         resourceType as string,
         resourceId as string
       );
-      res.json(logs);
+      await sendJsonArray(res, logs);
     } catch (error) {
       res.status(500).json({ error: "Failed to fetch audit log" });
     }
@@ -2625,5 +3029,18 @@ export async function registerRoutes(app: Express): Promise<Server> {
 
   // console.log('WebSocket server initialized on /ws endpoint');
 
+  // The OCR queue lives in memory, so documents that were queued or mid-OCR when the
+  // previous process stopped are left 'pending'/'processing'. Pick them back up once the
+  // database has been migrated; this runs in the background and never blocks startup.
+  storage.ready
+    .then(() => storage.getDocumentsAwaitingOCR())
+    .then(unfinishedOCR => {
+      if (unfinishedOCR.length > 0) {
+        console.log(`Re-queueing OCR for ${unfinishedOCR.length} unfinished documents`);
+        unfinishedOCR.forEach(document => enqueueDocumentOCR(document.id));
+      }
+    })
+    .catch(error => console.error('Failed to re-queue unfinished OCR jobs:', error));
+
   return httpServer;
 }
@@ -31,8 +31,51 @@ import {
 // Import the destructured schema objects based on database type
 import { randomUUID } from "crypto";
 import bcrypt from "bcrypt";
-import { db } from "./db-local";
-import { eq, and, sql } from "drizzle-orm";
+import { db, onBeforeClose } from "./db-local";
+import { eq, and, or, gt, desc, inArray, isNotNull, sql, getTableColumns, type Column, type SQL } from "drizzle-orm";
+
+// Document row without the legacy file_content BLOB; list queries never need the bytes
+export type DocumentMetadata = Omit<Document, 'fileContent'>;
+const { fileContent: _fileContent, ...documentMetadataColumns } = getTableColumns(documents);
+
+// Lightweight claim projection for aggregations (skips JSON/text columns like coordinates and notes)
+export type ClaimSummary = Pick<Claim,
+  'id' | 'state' | 'district' | 'landType' | 'status' | 'dateSubmitted' | 'dateProcessed' | 'createdAt'>;
+
+// Document projection for OCR analytics (skips the OCR text, which can be tens of KB per row)
+export type DocumentOCRSummary = Pick<Document,
+  'id' | 'ocrStatus' | 'confidence' | 'extractedData' | 'createdAt' | 'updatedAt'>;
+
+// Equality filters for paging through claims; unset fields don't filter
+export type ClaimFilter = { state?: string; district?: string; status?: string; assignedOfficer?: string };
+
+const claimColumns = getTableColumns(claims);
+
+function claimFilterCondition(filter: ClaimFilter) {
+  return and(
+    filter.state ? eq(claims.state, filter.state) : undefined,
+    filter.district ? eq(claims.district, filter.district) : undefined,
+    filter.status ? eq(claims.status, filter.status) : undefined,
+    filter.assignedOfficer ? eq(claims.assignedOfficer, filter.assignedOfficer) : undefined
+  );
+}
+
+// Position in a newest-first listing: the timestamp (unix seconds, or -1 when the row has none)
+// and id of the last row already returned
+export type PageCursor = { at: number; id: string };
+
+// Documents created before created_at had a default may have none; those sort last, as -1
+const documentCreatedAtKey = sql`coalesce(${documents.createdAt}, -1)`;
+
+// Rows strictly after the cursor in (timestamp DESC, id DESC) order. The plain `<=` bound lets
+// SQLite seek the date index; the row-value comparison then breaks ties on id.
+function beforeCursor(timestamp: Column | SQL, idColumn: Column, cursor?: PageCursor) {
+  if (!cursor) return undefined;
+  return sql`${timestamp} <= ${cursor.at} and (${timestamp}, ${idColumn}) < (${cursor.at}, ${cursor.id})`;
+}
+
+// Equality filters for paging through documents; unset fields don't filter
+export type DocumentFilter = { claimId?: string; ocrStatus?: string };
 
 export interface IStorage {
   // User management
@@ -49,6 +92,8 @@ export interface IStorage {
   // Session management
   createSession(session: InsertSession): Promise<UserSession>;
   getSession(token: string): Promise<UserSession | undefined>;
+  getSessionWithUser(token: string): Promise<{ session: UserSession; user: User } | undefined>;
+  deleteExpiredSessions(): Promise<number>;
   deleteSession(token: string): Promise<boolean>;
   deleteUserSessions(userId: string): Promise<boolean>;
 
@@ -59,28 +104,45 @@ export interface IStorage {
   getClaimsByDistrict(district: string): Promise<Claim[]>;
   getClaimsByOfficer(officerId: string): Promise<Claim[]>;
   createClaim(claim: InsertClaim): Promise<Claim>;
+  createClaims(claims: InsertClaim[]): Promise<(Claim | Error)[]>;
   updateClaim(id: string, updates: Partial<Claim>): Promise<Claim | undefined>;
+  updateClaims(ids: string[], updates: Partial<Claim>): Promise<string[]>;
+  iterateClaims(filter?: ClaimFilter, batchSize?: number): AsyncGenerator<Claim[]>;
+  getClaimsPage(filter: ClaimFilter, limit: number, before?: PageCursor): Promise<Claim[]>;
   deleteClaim(id: string): Promise<boolean>;
   getClaimsByStatus(status: string): Promise<Claim[]>;
+  getClaimSummaries(): Promise<ClaimSummary[]>;
+  getClaimsVersion(): Promise<string>;
+  getClaimStatusStats(state?: string): Promise<{ status: string; count: number; totalArea: number }[]>;
+  getRecentClaimsByState(state: string, limit: number): Promise<Claim[]>;
 
   // Document management
-  getAllDocuments(): Promise<Document[]>;
+  getAllDocuments(): Promise<DocumentMetadata[]>;
   getDocument(id: string): Promise<Document | undefined>;
-  getDocumentsByClaim(claimId: string): Promise<Document[]>;
-  getDocumentsByStatus(status: string): Promise<Document[]>;
+  getDocumentMetadata(id: string): Promise<DocumentMetadata | undefined>;
+  getDocumentsByClaim(claimId: string): Promise<DocumentMetadata[]>;
+  getDocumentsByStatus(status: string): Promise<DocumentMetadata[]>;
+  getDocumentOCRSummaries(): Promise<DocumentOCRSummary[]>;
+  getDocumentsAwaitingOCR(): Promise<{ id: string }[]>;
+  getDocumentsPage(filter: DocumentFilter, limit: number, before?: PageCursor): Promise<DocumentMetadata[]>;
   createDocument(document: InsertDocument): Promise<Document>;
-  updateDocument(id: string, updates: Partial<Document>): Promise<Document | undefined>;
+  updateDocument(id: string, updates: Partial<Document>): Promise<DocumentMetadata | undefined>;
   deleteDocument(id: string): Promise<boolean>;
+  getDocumentStatusCounts(): Promise<{ ocrStatus: string; count: number }[]>;
+  getDocumentReviewStatusCounts(): Promise<{ reviewStatus: string | null; count: number }[]>;
+  getDocumentsPendingReview(): Promise<DocumentMetadata[]>;
 
   // States and Districts
   getAllStates(): Promise<State[]>;
   getState(id: number): Promise<State | undefined>;
   getDistrictsByState(stateId: number): Promise<District[]>;
   getDistrict(id: number): Promise<District | undefined>;
+  invalidateReferenceCache(): void;
 
 
   // Audit logging
-  logAudit(entry: Omit<AuditLogEntry, 'id' | 'createdAt'>): Promise<AuditLogEntry>;
+  logAudit(entry: Omit<AuditLogEntry, 'id' | 'createdAt'>): Promise<void>;
+  flushAuditLog(): void;
   getAuditLog(resourceType?: string, resourceId?: string): Promise<AuditLogEntry[]>;
 
   // Workflow management
@@ -98,10 +160,69 @@ export interface IStorage {
 
 // Add PostGIS extension and initialize database with seed data
 export class DatabaseStorage implements IStorage {
-  private static readonly SALT_ROUNDS = 12;
+  // bcrypt cost for stored passwords; each +1 doubles login CPU. Existing hashes are
+  // re-hashed at this cost on their next successful login.
+  private static readonly SALT_ROUNDS = DatabaseStorage.parseSaltRounds(process.env.BCRYPT_ROUNDS);
+  // Demo accounts have published passwords, so a high cost only slows down first boot
+  private static readonly SEED_SALT_ROUNDS = 4;
+  private static readonly SESSION_CLEANUP_INTERVAL_MS = 60 * 60 * 1000;
+  private static readonly SESSION_CACHE_TTL_MS = 30 * 1000;
+  private static readonly SESSION_CACHE_MAX_ENTRIES = 10000;
+  private static readonly AUDIT_FLUSH_BATCH_SIZE = 500;
+  // Keeps IN (...) lists well under SQLite's bound-parameter limit
+  private static readonly MAX_IDS_PER_STATEMENT = 500;
+  private static readonly AUDIT_FLUSH_INTERVAL_MS = 1000;
+  // Rows per multi-row claims INSERT (~20 columns each, under SQLite's 32766 bound-parameter limit)
+  private static readonly CLAIM_INSERT_BATCH_SIZE = 500;
+
+  // Audit entries are buffered and written in one multi-row INSERT per batch
+  private auditQueue: (typeof auditLog.$inferInsert)[] = [];
+  private auditFlushTimer: NodeJS.Timeout | null = null;
+
+  // Short-lived cache of validated sessions so most authenticated requests skip SQLite
+  private sessionCache = new Map<string, { session: UserSession; user: User; cachedAt: number }>();
+
+  // Hot lookups are prepared once and reused, skipping query building and SQL compilation per call.
+  // Prepared lazily because better-sqlite3 compiles eagerly and the tables may not exist yet.
+  private preparedStatements?: ReturnType<DatabaseStorage['prepareStatements']>;
+
+  private prepareStatements() {
+    return {
+      userById: db.select().from(users).where(eq(users.id, sql.placeholder('id'))).prepare(),
+      claimById: db.select().from(claims).where(eq(claims.id, sql.placeholder('id'))).prepare(),
+      documentById: db.select().from(documents).where(eq(documents.id, sql.placeholder('id'))).prepare(),
+      documentMetadataById: db.select(documentMetadataColumns).from(documents).where(eq(documents.id, sql.placeholder('id'))).prepare(),
+      sessionWithUser: db
+        .select({ session: userSessions, user: users })
+        .from(userSessions)
+        .innerJoin(users, eq(users.id, userSessions.userId))
+        .where(and(
+          eq(userSessions.token, sql.placeholder('token')),
+          sql`${userSessions.expiresAt} > unixepoch()`
+        ))
+        .prepare(),
+    };
+  }
+
+  private get statements() {
+    return this.preparedStatements ??= this.prepareStatements();
+  }
+
+  // In-process cache of states/districts; reference data only changes on imports
+  private statesCache: { list: State[]; byId: Map<number, State> } | null = null;
+  private districtsCache: { byId: Map<number, District>; byState: Map<number, District[]> } | null = null;
+  // Bumped on every claim write made through this process (updated_at only has second precision)
+  private claimWrites = 0;
+
+  // Resolves once migrations and seeding have run; queries issued at startup must wait for it
+  readonly ready: Promise<void>;
 
   constructor() {
-    this.initializeDatabase();
+    this.ready = this.initializeDatabase();
+    // better-sqlite3 is synchronous, so pending audit entries can still be written at shutdown:
+    // before the connection is closed on SIGTERM/SIGINT, and on any other exit
+    onBeforeClose(() => this.flushAuditLog());
+    process.once('exit', () => this.flushAuditLog());
   }
 
   private async initializeDatabase() {
@@ -113,6 +234,13 @@ export class DatabaseStorage implements IStorage {
 
       // Then seed initial data
       await this.seedInitialData();
+      this.invalidateReferenceCache();
+
+      // Purge expired sessions periodically to keep the sessions table and its indexes small
+      await this.deleteExpiredSessions();
+      setInterval(() => {
+        this.deleteExpiredSessions().catch(error => console.error('Expired session cleanup failed:', error));
+      }, DatabaseStorage.SESSION_CLEANUP_INTERVAL_MS).unref();
       console.log('Database initialized successfully');
     } catch (error) {
       console.error('Database initialization error:', error);
@@ -137,8 +265,6 @@ export class DatabaseStorage implements IStorage {
         { id: 6, name: "Gujarat", code: "GJ", language: "Gujarati" },
       ];
 
-      await db.insert(states).values(statesData);
-
       // Seed districts  
       const districtsData = [
         { id: 1, name: "Mandla", stateId: 1 },
@@ -149,47 +275,73 @@ export class DatabaseStorage implements IStorage {
         { id: 6, name: "Warangal", stateId: 3 },
       ];
 
-      await db.insert(districts).values(districtsData);
+      // Hash demo passwords concurrently (bcrypt runs on the libuv thread pool)
+      const [adminHash, stateHash, districtHash, villageHash] = await Promise.all(
+        ["admin123", "state123", "district123", "village123"].map(
+          pw => this.hashPassword(pw, DatabaseStorage.SEED_SALT_ROUNDS)
+        )
+      );
 
       // Seed demo users with hashed passwords
       const demoUsersData = [
         {
           id: "admin-1", username: "ministry.admin", email: "admin@tribal.gov.in",
-          password: await this.hashPassword("admin123"), fullName: "Ministry Administrator", role: "ministry",
+          password: adminHash, fullName: "Ministry Administrator", role: "ministry",
           stateId: null, districtId: null, isActive: true
         },
         {
           id: "state-1", username: "mp.admin", email: "mp@tribal.gov.in",
-          password: await this.hashPassword("state123"), fullName: "MP State Administrator", role: "state",
+          password: stateHash, fullName: "MP State Administrator", role: "state",
           stateId: 1, districtId: null, isActive: true
         },
         {
           id: "district-1", username: "district.officer", email: "district@tribal.gov.in",
-          password: await this.hashPassword("district123"), fullName: "District Officer", role: "district",
+          password: districtHash, fullName: "District Officer", role: "district",
           stateId: 1, districtId: 1, isActive: true
         },
         {
           id: "village-1", username: "village.officer", email: "village@tribal.gov.in",
-          password: await this.hashPassword("village123"), fullName: "Village Officer", role: "village",
+          password: villageHash, fullName: "Village Officer", role: "village",
           stateId: 1, districtId: 1, isActive: true
         }
       ];
 
-      await db.insert(users).values(demoUsersData);
+      // Hashing is done up front, so the inserts run in one synchronous transaction and a
+      // failure can't leave a half-seeded database (same as the migrate-sqlite seed)
+      db.transaction((tx) => {
+        tx.insert(states).values(statesData).run();
+        tx.insert(districts).values(districtsData).run();
+        tx.insert(users).values(demoUsersData).run();
+      });
       console.log('Demo users initialized with hashed passwords');
     } catch (error) {
       console.error('Failed to seed initial data:', error);
     }
   }
 
-  private async hashPassword(password: string): Promise<string> {
-    return bcrypt.hash(password, DatabaseStorage.SALT_ROUNDS);
+  private static parseSaltRounds(value: string | undefined): number {
+    const rounds = parseInt(value || '', 10);
+    // Below 10 is too weak for real accounts; above 14 makes every login take seconds
+    return Number.isInteger(rounds) && rounds >= 10 && rounds <= 14 ? rounds : 12;
+  }
+
+  private async hashPassword(password: string, rounds: number = DatabaseStorage.SALT_ROUNDS): Promise<string> {
+    return bcrypt.hash(password, rounds);
+  }
+
+  // Bring a verified password's hash to the configured cost, off the login response path
+  private rehashPasswordIfNeeded(user: User, password: string): void {
+    if (bcrypt.getRounds(user.password) === DatabaseStorage.SALT_ROUNDS) {
+      return;
+    }
+    this.hashPassword(password)
+      .then(hash => db.update(users).set({ password: hash }).where(eq(users.id, user.id)).run())
+      .catch(error => console.error('[Auth] Password rehash failed:', error));
   }
 
   // User management
   async getUser(id: string): Promise<User | undefined> {
-    const [user] = await db.select().from(users).where(eq(users.id, id));
-    return user || undefined;
+    return this.statements.userById.get({ id }) || undefined;
   }
 
   async getUserByUsername(username: string): Promise<User | undefined> {
@@ -221,10 +373,13 @@ export class DatabaseStorage implements IStorage {
       .set({ ...updates, updatedAt: new Date() })
       .where(eq(users.id, id))
       .returning();
+    // Cached sessions carry the user row; drop them so role and isActive changes apply on the next request
+    this.evictCachedSessionsForUser(id);
     return user || undefined;
   }
 
   async deleteUser(id: string): Promise<boolean> {
+    this.evictCachedSessionsForUser(id);
     const result = await db.delete(users).where(eq(users.id, id));
     return (result.changes ?? 0) > 0;
   }
@@ -256,6 +411,7 @@ export class DatabaseStorage implements IStorage {
         console.log(`[Auth] Login failed: Invalid password for user '${username}'`);
       } else {
         console.log(`[Auth] Login successful for user '${username}'`);
+        this.rehashPasswordIfNeeded(user, password);
       }
       return isValidPassword ? user : null;
     } catch (error) {
@@ -284,12 +440,53 @@ export class DatabaseStorage implements IStorage {
     return session || undefined;
   }
 
+  // Validate a session token and load its user in a single indexed query
+  async getSessionWithUser(token: string): Promise<{ session: UserSession; user: User } | undefined> {
+    const now = Date.now();
+    const cached = this.sessionCache.get(token);
+    if (cached) {
+      if (now - cached.cachedAt < DatabaseStorage.SESSION_CACHE_TTL_MS && cached.session.expiresAt.getTime() > now) {
+        return { session: cached.session, user: cached.user };
+      }
+      this.sessionCache.delete(token);
+    }
+
+    const row = this.statements.sessionWithUser.get({ token });
+
+    if (row) {
+      if (this.sessionCache.size >= DatabaseStorage.SESSION_CACHE_MAX_ENTRIES) {
+        // Map iterates in insertion order, so the first key is the oldest entry
+        const oldestToken = this.sessionCache.keys().next().value;
+        if (oldestToken !== undefined) {
+          this.sessionCache.delete(oldestToken);
+        }
+      }
+      this.sessionCache.set(token, { ...row, cachedAt: now });
+    }
+    return row || undefined;
+  }
+
+  private evictCachedSessionsForUser(userId: string): void {
+    this.sessionCache.forEach((entry, token) => {
+      if (entry.user.id === userId) {
+        this.sessionCache.delete(token);
+      }
+    });
+  }
+
+  async deleteExpiredSessions(): Promise<number> {
+    const result = await db.delete(userSessions).where(sql`${userSessions.expiresAt} <= unixepoch()`);
+    return result.changes ?? 0;
+  }
+
   async deleteSession(token: string): Promise<boolean> {
+    this.sessionCache.delete(token);
     const result = await db.delete(userSessions).where(eq(userSessions.token, token));
     return (result.changes ?? 0) > 0;
   }
 
   async deleteUserSessions(userId: string): Promise<boolean> {
+    this.evictCachedSessionsForUser(userId);
     const result = await db.delete(userSessions).where(eq(userSessions.userId, userId));
     return (result.changes ?? 0) > 0;
   }
@@ -300,8 +497,7 @@ export class DatabaseStorage implements IStorage {
   }
 
   async getClaim(id: string): Promise<Claim | undefined> {
-    const [claim] = await db.select().from(claims).where(eq(claims.id, id));
-    return claim || undefined;
+    return this.statements.claimById.get({ id }) || undefined;
   }
 
   async getClaimsByState(state: string): Promise<Claim[]> {
@@ -321,43 +517,176 @@ export class DatabaseStorage implements IStorage {
       .insert(claims)
       .values(insertClaim)
       .returning();
+    this.claimWrites++;
     return claim;
   }
 
+  // Inserts all rows in one transaction with one multi-row INSERT per CLAIM_INSERT_BATCH_SIZE rows.
+  // Each chunk runs under a SAVEPOINT; if it fails, the chunk is retried row by row under per-row
+  // SAVEPOINTs so a failing row is rolled back alone and its Error returned in its slot, while the
+  // rest of the batch commits together
+  async createClaims(insertClaims: InsertClaim[]): Promise<(Claim | Error)[]> {
+    const chunkSize = DatabaseStorage.CLAIM_INSERT_BATCH_SIZE;
+    const toError = (error: unknown) => error instanceof Error ? error : new Error(String(error));
+
+    const results = db.transaction((tx) => {
+      const inserted: (Claim | Error)[] = [];
+      for (let i = 0; i < insertClaims.length; i += chunkSize) {
+        const chunk = insertClaims.slice(i, i + chunkSize);
+        try {
+          const rows = tx.transaction((savepoint) => savepoint.insert(claims).values(chunk).returning().all());
+          // RETURNING order is unspecified in SQLite; claim_id is unique, so match rows on it
+          const byClaimId = new Map(rows.map(row => [row.claimId, row]));
+          for (const insertClaim of chunk) {
+            inserted.push(byClaimId.get(insertClaim.claimId)!);
+          }
+        } catch {
+          for (const insertClaim of chunk) {
+            try {
+              inserted.push(tx.transaction((savepoint) => savepoint.insert(claims).values(insertClaim).returning().get()));
+            } catch (error) {
+              inserted.push(toError(error));
+            }
+          }
+        }
+      }
+      return inserted;
+    });
+    this.claimWrites++;
+    return results;
+  }
+
   async updateClaim(id: string, updates: Partial<Claim>): Promise<Claim | undefined> {
     const [claim] = await db
       .update(claims)
       .set({ ...updates, updatedAt: new Date() })
       .where(eq(claims.id, id))
       .returning();
+    this.claimWrites++;
     return claim || undefined;
   }
 
+  // Applies the same updates to every listed claim with one UPDATE ... WHERE id IN (...) per
+  // chunk, all in one transaction. Returns the ids that existed and were updated.
+  async updateClaims(ids: string[], updates: Partial<Claim>): Promise<string[]> {
+    const chunkSize = DatabaseStorage.MAX_IDS_PER_STATEMENT;
+    const updated = db.transaction((tx) => {
+      const updatedIds: string[] = [];
+      for (let i = 0; i < ids.length; i += chunkSize) {
+        const rows = tx
+          .update(claims)
+          .set({ ...updates, updatedAt: new Date() })
+          .where(inArray(claims.id, ids.slice(i, i + chunkSize)))
+          .returning({ id: claims.id })
+          .all();
+        for (const row of rows) updatedIds.push(row.id);
+      }
+      return updatedIds;
+    });
+    this.claimWrites++;
+    return updated;
+  }
+
   async deleteClaim(id: string): Promise<boolean> {
     const result = await db.delete(claims).where(eq(claims.id, id));
+    this.claimWrites++;
     return (result.changes ?? 0) > 0;
   }
 
+  // Pages through claims in rowid (insertion) order, the order an unordered full-table read
+  // returns, using rowid as the keyset (not OFFSET) so large result sets can be streamed
+  // without holding every row in memory
+  async *iterateClaims(filter: ClaimFilter = {}, batchSize = 1000): AsyncGenerator<Claim[]> {
+    let lastRowid: number | undefined;
+    while (true) {
+      const rows = await db.select({ ...claimColumns, rowid: sql<number>`${claims}.rowid` }).from(claims)
+        .where(and(claimFilterCondition(filter), lastRowid !== undefined ? sql`${claims}.rowid > ${lastRowid}` : undefined))
+        .orderBy(sql`${claims}.rowid`)
+        .limit(batchSize);
+
+      if (rows.length > 0) {
+        yield rows.map(({ rowid: _rowid, ...claim }) => claim);
+      }
+      if (rows.length < batchSize) {
+        return;
+      }
+      lastRowid = rows[rows.length - 1].rowid;
+    }
+  }
+
+  // One page of claims, most recently submitted first, keyset-paged on (date_submitted, id) so
+  // the date indexes serve both the filter and the order; id breaks ties between equal dates
+  async getClaimsPage(filter: ClaimFilter, limit: number, before?: PageCursor): Promise<Claim[]> {
+    return await db.select().from(claims)
+      .where(and(claimFilterCondition(filter), beforeCursor(claims.dateSubmitted, claims.id, before)))
+      .orderBy(desc(claims.dateSubmitted), desc(claims.id))
+      .limit(limit);
+  }
+
   async getClaimsByStatus(status: string): Promise<Claim[]> {
     return await db.select().from(claims).where(eq(claims.status, status));
   }
 
+  async getClaimSummaries(): Promise<ClaimSummary[]> {
+    return await db.select({
+      id: claims.id,
+      state: claims.state,
+      district: claims.district,
+      landType: claims.landType,
+      status: claims.status,
+      dateSubmitted: claims.dateSubmitted,
+      dateProcessed: claims.dateProcessed,
+      createdAt: claims.createdAt
+    }).from(claims);
+  }
+
+  // One row per claim status with its count and summed area, optionally for a single state
+  async getClaimStatusStats(state?: string): Promise<{ status: string; count: number; totalArea: number }[]> {
+    return await db.select({
+      status: claims.status,
+      count: sql<number>`count(*)`,
+      totalArea: sql<number>`coalesce(sum(${claims.area}), 0)`
+    }).from(claims).where(state ? eq(claims.state, state) : undefined).groupBy(claims.status);
+  }
+
+  async getRecentClaimsByState(state: string, limit: number): Promise<Claim[]> {
+    return await db.select().from(claims)
+      .where(eq(claims.state, state))
+      .orderBy(desc(claims.dateSubmitted))
+      .limit(limit);
+  }
+
+  // Changes whenever the claims table does; used as the cache key for derived aggregates.
+  // ix_claims_updated_at turns max(updated_at) into an index lookup, and count(*) walks that
+  // narrow index rather than the table rows.
+  async getClaimsVersion(): Promise<string> {
+    const [row] = await db.select({
+      count: sql<number>`count(*)`,
+      lastUpdated: sql<number | null>`max(${claims.updatedAt})`
+    }).from(claims);
+    return `${row.count}:${row.lastUpdated ?? 0}:${this.claimWrites}`;
+  }
+
   // Document management
-  async getAllDocuments(): Promise<Document[]> {
-    return await db.select().from(documents);
+  async getAllDocuments(): Promise<DocumentMetadata[]> {
+    return await db.select(documentMetadataColumns).from(documents);
   }
 
   async getDocument(id: string): Promise<Document | undefined> {
-    const [document] = await db.select().from(documents).where(eq(documents.id, id));
-    return document || undefined;
+    return this.statements.documentById.get({ id }) || undefined;
   }
 
-  async getDocumentsByClaim(claimId: string): Promise<Document[]> {
-    return await db.select().from(documents).where(eq(documents.claimId, claimId));
+  // Same row without the legacy file_content BLOB, for callers that never touch the file
+  async getDocumentMetadata(id: string): Promise<DocumentMetadata | undefined> {
+    return this.statements.documentMetadataById.get({ id }) || undefined;
   }
 
-  async getDocumentsByStatus(status: string): Promise<Document[]> {
-    return await db.select().from(documents).where(eq(documents.ocrStatus, status));
+  async getDocumentsByClaim(claimId: string): Promise<DocumentMetadata[]> {
+    return await db.select(documentMetadataColumns).from(documents).where(eq(documents.claimId, claimId));
+  }
+
+  async getDocumentsByStatus(status: string): Promise<DocumentMetadata[]> {
+    return await db.select(documentMetadataColumns).from(documents).where(eq(documents.ocrStatus, status));
   }
 
   async createDocument(insertDocument: InsertDocument): Promise<Document> {
@@ -368,12 +697,13 @@ export class DatabaseStorage implements IStorage {
     return document;
   }
 
-  async updateDocument(id: string, updates: Partial<Document>): Promise<Document | undefined> {
+  // Returns the updated row without the legacy file_content BLOB
+  async updateDocument(id: string, updates: Partial<Document>): Promise<DocumentMetadata | undefined> {
     const [document] = await db
       .update(documents)
       .set({ ...updates, updatedAt: new Date() })
       .where(eq(documents.id, id))
-      .returning();
+      .returning(documentMetadataColumns);
     return document || undefined;
   }
 
@@ -382,36 +712,155 @@ export class DatabaseStorage implements IStorage {
     return (result.changes ?? 0) > 0;
   }
 
+  async getDocumentStatusCounts(): Promise<{ ocrStatus: string; count: number }[]> {
+    return await db.select({
+      ocrStatus: documents.ocrStatus,
+      count: sql<number>`count(*)`
+    }).from(documents).groupBy(documents.ocrStatus);
+  }
+
+  async getDocumentReviewStatusCounts(): Promise<{ reviewStatus: string | null; count: number }[]> {
+    return await db.select({
+      reviewStatus: documents.reviewStatus,
+      count: sql<number>`count(*)`
+    }).from(documents).groupBy(documents.reviewStatus);
+  }
+
+  // Newest uploads first, keyset-paged on (created_at, id) like getClaimsPage, without the legacy
+  // file_content BLOB
+  async getDocumentsPage(filter: DocumentFilter, limit: number, before?: PageCursor): Promise<DocumentMetadata[]> {
+    return await db.select(documentMetadataColumns).from(documents)
+      .where(and(
+        filter.claimId ? eq(documents.claimId, filter.claimId) : undefined,
+        filter.ocrStatus ? eq(documents.ocrStatus, filter.ocrStatus) : undefined,
+        beforeCursor(documentCreatedAtKey, documents.id, before)
+      ))
+      .orderBy(desc(documentCreatedAtKey), desc(documents.id))
+      .limit(limit);
+  }
+
+  async getDocumentOCRSummaries(): Promise<DocumentOCRSummary[]> {
+    return await db.select({
+      id: documents.id,
+      ocrStatus: documents.ocrStatus,
+      confidence: documents.confidence,
+      extractedData: documents.extractedData,
+      createdAt: documents.createdAt,
+      updatedAt: documents.updatedAt
+    }).from(documents);
+  }
+
+  // Documents with a stored file whose OCR was queued or running but never finished
+  async getDocumentsAwaitingOCR(): Promise<{ id: string }[]> {
+    return await db.select({ id: documents.id }).from(documents).where(and(
+      inArray(documents.ocrStatus, ['pending', 'processing']),
+      or(isNotNull(documents.uploadPath), isNotNull(documents.fileContent))
+    ));
+  }
+
+  // Documents whose OCR has finished but which nobody has reviewed yet
+  async getDocumentsPendingReview(): Promise<DocumentMetadata[]> {
+    return await db.select(documentMetadataColumns).from(documents).where(and(
+      eq(documents.ocrStatus, 'completed'),
+      eq(documents.reviewStatus, 'pending')
+    ));
+  }
+
   // States and Districts
+  private async loadStates() {
+    if (!this.statesCache) {
+      const list = await db.select().from(states);
+      this.statesCache = { list, byId: new Map(list.map(state => [state.id, state])) };
+    }
+    return this.statesCache;
+  }
+
+  private async loadDistricts() {
+    if (!this.districtsCache) {
+      const list = await db.select().from(districts);
+      const byState = new Map<number, District[]>();
+      for (const district of list) {
+        const group = byState.get(district.stateId);
+        if (group) {
+          group.push(district);
+        } else {
+          byState.set(district.stateId, [district]);
+        }
+      }
+      this.districtsCache = { byId: new Map(list.map(district => [district.id, district])), byState };
+    }
+    return this.districtsCache;
+  }
+
+  // Must be called after any write to the states or districts tables
+  invalidateReferenceCache(): void {
+    this.statesCache = null;
+    this.districtsCache = null;
+  }
+
   async getAllStates(): Promise<State[]> {
-    return await db.select().from(states);
+    return (await this.loadStates()).list;
   }
 
   async getState(id: number): Promise<State | undefined> {
-    const [state] = await db.select().from(states).where(eq(states.id, id));
-    return state || undefined;
+    return (await this.loadStates()).byId.get(id);
   }
 
   async getDistrictsByState(stateId: number): Promise<District[]> {
-    return await db.select().from(districts).where(eq(districts.stateId, stateId));
+    return (await this.loadDistricts()).byState.get(stateId) ?? [];
   }
 
   async getDistrict(id: number): Promise<District | undefined> {
-    const [district] = await db.select().from(districts).where(eq(districts.id, id));
-    return district || undefined;
+    return (await this.loadDistricts()).byId.get(id);
   }
 
 
   // Audit logging
-  async logAudit(entry: Omit<AuditLogEntry, 'id' | 'createdAt'>): Promise<AuditLogEntry> {
-    const [auditEntry] = await db
-      .insert(auditLog)
-      .values(entry)
-      .returning();
-    return auditEntry;
+  // Queues the entry; it is written within AUDIT_FLUSH_INTERVAL_MS or once a full batch is waiting
+  async logAudit(entry: Omit<AuditLogEntry, 'id' | 'createdAt'>): Promise<void> {
+    this.auditQueue.push({ ...entry, createdAt: new Date() });
+
+    if (this.auditQueue.length >= DatabaseStorage.AUDIT_FLUSH_BATCH_SIZE) {
+      this.flushAuditLog();
+    } else if (!this.auditFlushTimer) {
+      this.auditFlushTimer = setTimeout(() => this.flushAuditLog(), DatabaseStorage.AUDIT_FLUSH_INTERVAL_MS);
+      this.auditFlushTimer.unref();
+    }
+  }
+
+  flushAuditLog(): void {
+    if (this.auditFlushTimer) {
+      clearTimeout(this.auditFlushTimer);
+      this.auditFlushTimer = null;
+    }
+    if (this.auditQueue.length === 0) {
+      return;
+    }
+
+    const batch = this.auditQueue;
+    this.auditQueue = [];
+    for (let i = 0; i < batch.length; i += DatabaseStorage.AUDIT_FLUSH_BATCH_SIZE) {
+      const chunk = batch.slice(i, i + DatabaseStorage.AUDIT_FLUSH_BATCH_SIZE);
+      try {
+        db.insert(auditLog).values(chunk).run();
+      } catch (error) {
+        // One bad entry fails the whole multi-row INSERT; write the chunk row by row so
+        // only the entries that really can't be stored are lost, and each one is reported
+        for (const entry of chunk) {
+          try {
+            db.insert(auditLog).values(entry).run();
+          } catch (entryError) {
+            console.error('Failed to write audit log entry:', entry, entryError);
+          }
+        }
+      }
+    }
   }
 
   async getAuditLog(resourceType?: string, resourceId?: string): Promise<AuditLogEntry[]> {
+    // Make sure queued entries are visible to readers
+    this.flushAuditLog();
+
     if (resourceType && resourceId) {
       return await db.select().from(auditLog).where(and(
         eq(auditLog.resourceType, resourceType),
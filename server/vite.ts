@@ -76,10 +76,17 @@ export function serveStatic(app: Express) {
     );
   }
 
+  // Vite emits content-hashed files under /assets, so browsers can cache them indefinitely
+  app.use(
+    "/assets",
+    express.static(path.join(distPath, "assets"), { immutable: true, maxAge: "1y" }),
+  );
   app.use(express.static(distPath));
 
   // fall through to index.html if the file doesn't exist
   app.use("*", (_req, res) => {
-    res.sendFile(path.resolve(distPath, "index.html"));
+    res.sendFile(path.resolve(distPath, "index.html"), {
+      headers: { "Cache-Control": "no-cache" },
+    });
   });
 }
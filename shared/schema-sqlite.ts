@@ -1,7 +1,8 @@
 import { sql } from "drizzle-orm";
-import { sqliteTable, text, integer, real, blob } from "drizzle-orm/sqlite-core";
+import { sqliteTable, text, integer, real, blob, index } from "drizzle-orm/sqlite-core";
 import { createInsertSchema } from "drizzle-zod";
 import { z } from "zod";
+import { uuidv7 } from "./uuid";
 
 // States and Districts
 export const states = sqliteTable("states", {
@@ -21,7 +22,7 @@ export const districts = sqliteTable("districts", {
 
 // Enhanced Users with roles
 export const users = sqliteTable("users", {
-  id: text("id").primaryKey().$defaultFn(() => crypto.randomUUID()),
+  id: text("id").primaryKey().$defaultFn(uuidv7),
   username: text("username").notNull().unique(),
   email: text("email").notNull().unique(),
   password: text("password").notNull(),
@@ -37,16 +38,18 @@ export const users = sqliteTable("users", {
 
 // User Sessions
 export const userSessions = sqliteTable("user_sessions", {
-  id: text("id").primaryKey().$defaultFn(() => crypto.randomUUID()),
+  id: text("id").primaryKey().$defaultFn(uuidv7),
   userId: text("user_id").references(() => users.id).notNull(),
   token: text("token").notNull().unique(),
   expiresAt: integer("expires_at", { mode: 'timestamp' }).notNull(),
   createdAt: integer("created_at", { mode: 'timestamp' }).default(sql`(unixepoch())`),
-});
+}, (table) => [
+  index("ix_user_sessions_expires_at").on(table.expiresAt),
+]);
 
 // Claims with enhanced fields
 export const claims = sqliteTable("claims", {
-  id: text("id").primaryKey().$defaultFn(() => crypto.randomUUID()),
+  id: text("id").primaryKey().$defaultFn(uuidv7),
   claimId: text("claim_id").notNull().unique(), // Human-readable ID like FRA-MH-2024-001234
   claimantName: text("claimant_name").notNull(),
   location: text("location").notNull(), // General location
@@ -68,18 +71,26 @@ export const claims = sqliteTable("claims", {
   notes: text("notes"),
   createdAt: integer("created_at", { mode: 'timestamp' }).default(sql`(unixepoch())`),
   updatedAt: integer("updated_at", { mode: 'timestamp' }).default(sql`(unixepoch())`),
-});
+}, (table) => [
+  index("ix_claims_status").on(table.status),
+  index("ix_claims_date_submitted").on(table.dateSubmitted),
+  index("ix_claims_updated_at").on(table.updatedAt),
+  index("ix_claims_state_status").on(table.state, table.status),
+  index("ix_claims_district_status").on(table.district, table.status),
+  index("ix_claims_state_date").on(table.state, sql`${table.dateSubmitted} DESC`),
+  index("ix_claims_assigned_officer_date").on(table.assignedOfficer, sql`${table.dateSubmitted} DESC`),
+]);
 
 // Documents
 export const documents = sqliteTable("documents", {
-  id: text("id").primaryKey().$defaultFn(() => crypto.randomUUID()),
+  id: text("id").primaryKey().$defaultFn(uuidv7),
   claimId: text("claim_id").references(() => claims.id),
   filename: text("filename").notNull(),
   originalFilename: text("original_filename").notNull(),
   fileType: text("file_type").notNull(),
   fileSize: integer("file_size").notNull(),
-  uploadPath: text("upload_path"), // Made nullable since files are stored in database now
-  fileContent: blob("file_content"), // Binary file content stored directly in database
+  uploadPath: text("upload_path"), // Path of the uploaded file on disk
+  fileContent: blob("file_content"), // Legacy: binary content of documents uploaded before disk storage
   ocrStatus: text("ocr_status").notNull(), // 'pending', 'processing', 'completed', 'failed'
   ocrText: text("ocr_text"),
   extractedData: text("extracted_data", { mode: 'json' }),
@@ -89,11 +100,15 @@ export const documents = sqliteTable("documents", {
   uploadedBy: text("uploaded_by").references(() => users.id).notNull(),
   createdAt: integer("created_at", { mode: 'timestamp' }).default(sql`(unixepoch())`),
   updatedAt: integer("updated_at", { mode: 'timestamp' }).default(sql`(unixepoch())`),
-});
+}, (table) => [
+  index("ix_documents_ocr_review").on(table.ocrStatus, table.reviewStatus),
+  index("ix_documents_claim_review").on(table.claimId, table.reviewStatus),
+  index("ix_documents_created_at_key").on(sql`coalesce(${table.createdAt}, -1)`),
+]);
 
 // Workflow Instances - Track individual workflow runs
 export const workflowInstances = sqliteTable("workflow_instances", {
-  id: text("id").primaryKey().$defaultFn(() => crypto.randomUUID()),
+  id: text("id").primaryKey().$defaultFn(uuidv7),
   name: text("name").notNull(), // User-friendly name for the workflow
   description: text("description"),
   status: text("status").notNull().default('active'), // 'active', 'completed', 'cancelled', 'paused'
@@ -111,7 +126,7 @@ export const workflowInstances = sqliteTable("workflow_instances", {
 
 // Workflow Steps - Track step completion and data flow
 export const workflowSteps = sqliteTable("workflow_steps", {
-  id: text("id").primaryKey().$defaultFn(() => crypto.randomUUID()),
+  id: text("id").primaryKey().$defaultFn(uuidv7),
   workflowId: text("workflow_id").references(() => workflowInstances.id).notNull(),
   stepName: text("step_name").notNull(), // 'upload', 'process', 'review', 'claims', 'map', 'dss', 'reports'
   stepOrder: integer("step_order").notNull(),
@@ -129,7 +144,7 @@ export const workflowSteps = sqliteTable("workflow_steps", {
 
 // Workflow Transitions - Track data flow between steps
 export const workflowTransitions = sqliteTable("workflow_transitions", {
-  id: text("id").primaryKey().$defaultFn(() => crypto.randomUUID()),
+  id: text("id").primaryKey().$defaultFn(uuidv7),
   workflowId: text("workflow_id").references(() => workflowInstances.id).notNull(),
   fromStepId: text("from_step_id").references(() => workflowSteps.id),
   toStepId: text("to_step_id").references(() => workflowSteps.id).notNull(),
@@ -141,7 +156,7 @@ export const workflowTransitions = sqliteTable("workflow_transitions", {
 
 // Audit Log
 export const auditLog = sqliteTable("audit_log", {
-  id: text("id").primaryKey().$defaultFn(() => crypto.randomUUID()),
+  id: text("id").primaryKey().$defaultFn(uuidv7),
   userId: text("user_id").references(() => users.id).notNull(),
   action: text("action").notNull(),
   resourceType: text("resource_type").notNull(),
@@ -150,11 +165,15 @@ export const auditLog = sqliteTable("audit_log", {
   ipAddress: text("ip_address"),
   userAgent: text("user_agent"),
   createdAt: integer("created_at", { mode: 'timestamp' }).default(sql`(unixepoch())`),
-});
+}, (table) => [
+  index("ix_audit_log_user_id").on(table.userId),
+  index("ix_audit_log_resource_id").on(table.resourceId),
+  index("ix_audit_log_resource_created").on(table.resourceType, table.resourceId, sql`${table.createdAt} DESC`),
+]);
 
 // Government FRA Statistics from official sources (Parliament questions, Ministry reports)
 export const fraStatistics = sqliteTable("fra_statistics", {
-  id: text("id").primaryKey().$defaultFn(() => crypto.randomUUID()),
+  id: text("id").primaryKey().$defaultFn(uuidv7),
   stateName: text("state_name").notNull(),
   reportingPeriod: text("reporting_period").notNull(), // e.g., "30-06-2024"
   individualClaims: integer("individual_claims").notNull(),
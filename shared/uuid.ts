@@ -0,0 +1,20 @@
+// Time-ordered UUIDv7 (RFC 9562): a 48-bit millisecond timestamp followed by random bits.
+// Used for primary keys so new rows append to the end of SQLite's B-tree indexes
+// instead of landing on random pages like UUIDv4.
+export function uuidv7(): string {
+  const bytes = new Uint8Array(16);
+  crypto.getRandomValues(bytes);
+
+  const timestamp = Date.now();
+  bytes[0] = Math.floor(timestamp / 2 ** 40) & 0xff;
+  bytes[1] = Math.floor(timestamp / 2 ** 32) & 0xff;
+  bytes[2] = (timestamp >>> 24) & 0xff;
+  bytes[3] = (timestamp >>> 16) & 0xff;
+  bytes[4] = (timestamp >>> 8) & 0xff;
+  bytes[5] = timestamp & 0xff;
+  bytes[6] = (bytes[6] & 0x0f) | 0x70; // version 7
+  bytes[8] = (bytes[8] & 0x3f) | 0x80; // RFC 4122 variant
+
+  const hex = Array.from(bytes, b => b.toString(16).padStart(2, "0")).join("");
+  return `${hex.slice(0, 8)}-${hex.slice(8, 12)}-${hex.slice(12, 16)}-${hex.slice(16, 20)}-${hex.slice(20)}`;
+}
@@ -0,0 +1,17 @@
+import assert from 'node:assert/strict';
+import { resolveOCRConfidence } from './server/ocr-confidence';
+
+const estimate = () => 70;
+
+// Tesseract's measured score is stored even though extractStructuredData labels its result 'High'
+assert.equal(resolveOCRConfidence(87.5, 'High', estimate), 87.5);
+assert.equal(resolveOCRConfidence(0, 'Unknown', estimate), 0);
+
+// Without a Tesseract score (Gemini OCR, PDFs), a numeric extraction score is used...
+assert.equal(resolveOCRConfidence(null, 92, estimate), 92);
+
+// ...and string labels fall back to the heuristic estimate instead of reaching the REAL column
+assert.equal(resolveOCRConfidence(null, 'Medium', estimate), 70);
+assert.equal(resolveOCRConfidence(null, undefined, estimate), 70);
+
+console.log('OCR confidence tests passed');